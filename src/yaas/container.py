@@ -422,7 +422,7 @@ def _add_optional_mounts(
                     mounts.append(mount)
 
     if config.ssh_agent:
-        _add_ssh_agent(mounts)
+        _add_ssh_agent(mounts, home)
 
     if config.docker_host_socket:
         _add_docker_host_socket(mounts)
@@ -431,7 +431,7 @@ def _add_optional_mounts(
         _add_clipboard_support(mounts)
 
 
-def _add_ssh_agent(mounts: list[Mount]) -> None:
+def _add_ssh_agent(mounts: list[Mount], home: Path) -> None:
     """Mount SSH agent socket with platform-aware detection."""
     # Use platform-aware socket detection (handles macOS launchd sockets)
     sock_path = get_ssh_agent_socket()
@@ -442,7 +442,7 @@ def _add_ssh_agent(mounts: list[Mount]) -> None:
     mounts.append(Mount(str(sock_path), "/ssh-agent"))
 
     # Mount known_hosts so SSH recognizes previously-verified hosts
-    known_hosts = Path.home() / ".ssh" / "known_hosts"
+    known_hosts = home / ".ssh" / "known_hosts"
     if known_hosts.exists():
         mounts.append(Mount(str(known_hosts), "/etc/ssh/ssh_known_hosts", read_only=True))
 
@@ -5,8 +5,24 @@ from __future__ import annotations
 import glob
 import os
 import sys
+import time
+from functools import lru_cache
 from pathlib import Path
 
+# How long a glob result is reused before the filesystem is scanned again
+_GLOB_TTL = 5.0
+
+_glob_cache: dict[str, tuple[float, tuple[str, ...]]] = {}
+
+# Linux socket locations, in probe order ({uid} is filled in per user)
+_PODMAN_SOCKET_TEMPLATES = ("/run/user/{uid}/podman/podman.sock", "/run/podman/podman.sock")
+_LINUX_DOCKER_SOCKETS = ("/var/run/docker.sock", "/run/docker.sock")
+
+
+def _env(name: str) -> str | None:
+    """Read an environment variable (the one seam tests patch to fake the environment)."""
+    return os.environ.get(name)
+
 
 class PlatformError(Exception):
     """Raised when an operation is not supported on the current platform."""
@@ -14,29 +30,39 @@ class PlatformError(Exception):
     pass
 
 
+# sys.platform is fixed for the life of the process, so evaluate these once
+IS_LINUX = sys.platform == "linux"
+IS_MACOS = sys.platform == "darwin"
+IS_WINDOWS = sys.platform == "win32"
+
+
 def is_linux() -> bool:
     """Check if running on Linux."""
-    return sys.platform == "linux"
+    return IS_LINUX
 
 
 def is_macos() -> bool:
     """Check if running on macOS."""
-    return sys.platform == "darwin"
+    return IS_MACOS
 
 
 def is_windows() -> bool:
     """Check if running on Windows (native, not WSL)."""
-    return sys.platform == "win32"
+    return IS_WINDOWS
 
 
+@lru_cache(maxsize=1)
 def is_wsl() -> bool:
-    """Check if running in WSL (Windows Subsystem for Linux)."""
-    if sys.platform != "linux":
+    """Check if running in WSL (Windows Subsystem for Linux).
+
+    Cached, since the kernel cannot change under a running process.
+    """
+    if not IS_LINUX:
         return False
     # WSL sets this in /proc/version
     try:
-        with open("/proc/version") as f:
-            return "microsoft" in f.read().lower()
+        with open("/proc/version", "rb") as f:
+            return b"microsoft" in f.read(256).lower()
     except OSError:
         return False
 
@@ -64,7 +90,7 @@ def get_ssh_agent_socket() -> Path | None:
     Returns None if no SSH agent socket is found.
     """
     # First check SSH_AUTH_SOCK (works on all platforms)
-    ssh_sock = os.environ.get("SSH_AUTH_SOCK")
+    ssh_sock = _env("SSH_AUTH_SOCK")
     if ssh_sock:
         sock_path = Path(ssh_sock)
         if sock_path.exists():
@@ -74,8 +100,7 @@ def get_ssh_agent_socket() -> Path | None:
     if is_macos():
         # macOS SSH agent sockets are in /private/tmp/com.apple.launchd.*/Listeners
         pattern = "/private/tmp/com.apple.launchd.*/Listeners"
-        matches = glob.glob(pattern)
-        for match in matches:
+        for match in _cached_glob(pattern):
             sock_path = Path(match)
             if sock_path.exists():
                 return sock_path
@@ -83,6 +108,20 @@ def get_ssh_agent_socket() -> Path | None:
     return None
 
 
+def _cached_glob(pattern: str) -> tuple[str, ...]:
+    """glob.glob with results reused for _GLOB_TTL seconds.
+
+    Short enough that a restarted agent's new socket is still picked up.
+    """
+    now = time.monotonic()
+    cached = _glob_cache.get(pattern)
+    if cached is not None and now - cached[0] < _GLOB_TTL:
+        return cached[1]
+    matches = tuple(glob.glob(pattern))
+    _glob_cache[pattern] = (now, matches)
+    return matches
+
+
 def get_container_socket_paths(*, docker_only: bool = False) -> list[Path]:
     """Get possible container runtime socket paths.
 
@@ -93,37 +132,63 @@ def get_container_socket_paths(*, docker_only: bool = False) -> list[Path]:
         docker_only: If True, only return Docker socket paths (excludes Podman).
                      Used by DockerRuntime for availability checking.
     """
+    macos = is_macos()
+    uid = os.getuid() if not macos and is_linux() else 1000
+    return list(
+        _socket_paths(
+            docker_only,
+            # The home directory only matters for Docker Desktop, so skip the lookup elsewhere
+            Path.home() if macos else None,
+            uid,
+            _env("DOCKER_HOST") or "",
+            _env("XDG_RUNTIME_DIR"),
+        )
+    )
+
+
+@lru_cache(maxsize=8)
+def _socket_paths(
+    docker_only: bool,
+    macos_home: Path | None,
+    uid: int,
+    docker_host: str,
+    xdg_runtime: str | None,
+) -> tuple[Path, ...]:
+    """Build the socket path list for one combination of host inputs (cached).
+
+    macos_home is the user's home directory on macOS and None on other platforms.
+    """
     paths: list[Path] = []
-    home = Path.home()
 
     # Check DOCKER_HOST for custom socket path (highest priority)
-    docker_host = os.environ.get("DOCKER_HOST", "")
     if docker_host.startswith("unix://"):
         paths.append(Path(docker_host[7:]))  # Strip unix:// prefix
 
-    if is_macos():
+    if macos_home is not None:
         # Docker Desktop socket locations
-        paths.append(home / ".docker/run/docker.sock")
+        paths.append(macos_home / ".docker/run/docker.sock")
         paths.append(Path("/var/run/docker.sock"))  # Symlink by Docker Desktop
     else:
         # Linux socket paths
-        uid = os.getuid() if is_linux() else 1000
-
         # Podman sockets (skip if docker_only)
         if not docker_only:
-            paths.append(Path(f"/run/user/{uid}/podman/podman.sock"))
-            paths.append(Path("/run/podman/podman.sock"))
+            paths.extend(Path(t.format(uid=uid)) for t in _PODMAN_SOCKET_TEMPLATES)
 
         # Docker sockets
-        paths.append(Path("/var/run/docker.sock"))
-        paths.append(Path("/run/docker.sock"))
+        paths.extend(Path(p) for p in _LINUX_DOCKER_SOCKETS)
 
         # XDG_RUNTIME_DIR for rootless docker
-        xdg_runtime = os.environ.get("XDG_RUNTIME_DIR")
         if xdg_runtime:
             paths.append(Path(xdg_runtime) / "docker.sock")
 
-    return paths
+    return tuple(paths)
+
+
+def _clear_caches() -> None:
+    """Forget all cached host probes (for tests that fake a different host)."""
+    is_wsl.cache_clear()
+    _socket_paths.cache_clear()
+    _glob_cache.clear()
 
 
 def check_platform_support() -> None:
@@ -3,19 +3,34 @@
 from __future__ import annotations
 
 import json
+import shutil
 import subprocess
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from ..config import Config
 
 from ..logging import get_logger
-from .types import ContainerSpec, ExecSpec, _format_mount
+from .types import ContainerSpec, ExecSpec, _format_env, _format_mount
 
 logger = get_logger()
 
 
+@lru_cache(maxsize=16)
+def _which(cmd: str) -> str | None:
+    """shutil.which, cached so repeated runtime probes share one PATH scan per binary."""
+    return shutil.which(cmd)
+
+
+def _repeat_flag(flag: str, values: Iterable[str]) -> list[str]:
+    """Pair each value with ``flag``: ("-p", ["a", "b"]) -> ["-p", "a", "-p", "b"]."""
+    return [arg for value in values for arg in (flag, value)]
+
+
 class BaseRuntime(ABC):
     """Abstract base class with shared container runtime logic.
 
@@ -63,7 +78,7 @@ class BaseRuntime(ABC):
         self._add_runtime_specific_flags(cmd, spec)
 
         # Disable SELinux label confinement (needed for bind mounts)
-        cmd.extend(["--security-opt", "label=disable"])
+        cmd.extend(("--security-opt", "label=disable"))
 
         # Interactive/TTY
         if spec.tty:
@@ -75,78 +90,70 @@ class BaseRuntime(ABC):
 
         # Container name
         if spec.name:
-            cmd.extend(["--name", spec.name])
+            cmd.extend(("--name", spec.name))
 
         # Working directory
-        cmd.extend(["--workdir", spec.working_dir])
+        cmd.extend(("--workdir", spec.working_dir))
 
         # Network
         if spec.network_mode:
-            cmd.extend(["--network", spec.network_mode])
+            cmd.extend(("--network", spec.network_mode))
 
         # Port publishing
         if spec.ports:
-            for port in spec.ports:
-                cmd.extend(["-p", port])
+            cmd.extend(_repeat_flag("-p", spec.ports))
 
         # PID namespace
         if spec.pid_mode:
-            cmd.extend(["--pid", spec.pid_mode])
+            cmd.extend(("--pid", spec.pid_mode))
 
         # Init (tini/catatonit as PID 1)
         if spec.init:
             cmd.append("--init")
 
         # Labels
-        for key, value in spec.labels.items():
-            cmd.extend(["--label", f"{key}={value}"])
+        cmd.extend(_repeat_flag("--label", (f"{k}={v}" for k, v in spec.labels.items())))
 
         # Entrypoint override
         if spec.entrypoint is not None:
-            cmd.extend(["--entrypoint", json.dumps(spec.entrypoint)])
+            cmd.extend(("--entrypoint", json.dumps(spec.entrypoint)))
 
         # Runtime identifier
-        cmd.extend(["-e", f"YAAS_RUNTIME={self.name}"])
+        cmd.extend(("-e", f"YAAS_RUNTIME={self.name}"))
 
         # Environment
-        for key, value in spec.environment.items():
-            cmd.extend(["-e", f"{key}={value}"])
+        cmd.extend(_format_env(spec.environment))
 
         # Mounts
-        for m in spec.mounts:
-            cmd.extend(["--mount", _format_mount(m)])
+        cmd.extend(_repeat_flag("--mount", map(_format_mount, spec.mounts)))
 
         # Resource limits
         if spec.memory:
-            cmd.extend(["--memory", spec.memory])
             swap = spec.memory_swap or spec.memory
-            cmd.extend(["--memory-swap", swap])
+            cmd.extend(("--memory", spec.memory, "--memory-swap", swap))
 
         if spec.cpus:
-            cmd.extend(["--cpus", str(spec.cpus)])
+            cmd.extend(("--cpus", str(spec.cpus)))
 
         if spec.pids_limit:
-            cmd.extend(["--pids-limit", str(spec.pids_limit)])
+            cmd.extend(("--pids-limit", str(spec.pids_limit)))
 
         # Pass host supplementary groups (e.g. docker group for socket access)
         if spec.keep_groups:
-            cmd.extend(["--group-add", "keep-groups"])
+            cmd.extend(("--group-add", "keep-groups"))
 
         # Devices
         if spec.devices:
-            for device in spec.devices:
-                cmd.extend(["--device", device])
+            cmd.extend(_repeat_flag("--device", spec.devices))
 
         # Security
         if spec.privileged:
             cmd.append("--privileged")
         else:
-            for cap in spec.cap_drop:
-                cmd.extend(["--cap-drop", cap])
-            for cap in spec.cap_add:
-                cmd.extend(["--cap-add", cap])
+            cmd.extend(_repeat_flag("--cap-drop", spec.cap_drop))
+            cmd.extend(_repeat_flag("--cap-add", spec.cap_add))
             if spec.seccomp_profile:
-                cmd.extend(["--security-opt", f"seccomp={spec.seccomp_profile}"])
+                cmd.extend(("--security-opt", f"seccomp={spec.seccomp_profile}"))
 
     def _build_command(self, spec: ContainerSpec) -> list[str]:
         cmd = [*self.command_prefix, "run", "--rm"]
@@ -169,11 +176,10 @@ class BaseRuntime(ABC):
         if spec.stdin_open:
             cmd.append("-i")
         if spec.working_dir:
-            cmd.extend(["--workdir", spec.working_dir])
+            cmd.extend(("--workdir", spec.working_dir))
         if spec.user:
-            cmd.extend(["--user", spec.user])
-        for key, value in spec.environment.items():
-            cmd.extend(["-e", f"{key}={value}"])
+            cmd.extend(("--user", spec.user))
+        cmd.extend(_format_env(spec.environment))
         cmd.append(spec.container_name)
         cmd.extend(spec.command)
         return cmd
@@ -254,10 +260,10 @@ class BaseRuntime(ABC):
     ) -> list[dict[str, Any]]:
         cmd = [*self.command_prefix, "ps", "-a"]
         if prefix:
-            cmd.extend(["--filter", f"name={prefix}"])
+            cmd.extend(("--filter", f"name={prefix}"))
         for key, value in (labels or {}).items():
-            cmd.extend(["--filter", f"label={key}={value}"])
-        cmd.extend(["--format", "json"])
+            cmd.extend(("--filter", f"label={key}={value}"))
+        cmd.extend(("--format", "json"))
         result = subprocess.run(
             cmd,
             capture_output=True,
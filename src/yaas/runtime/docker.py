@@ -3,20 +3,28 @@
 from __future__ import annotations
 
 import os
-import shutil
 import subprocess
+from functools import lru_cache
+from pathlib import Path
 
 from ..platform import get_container_socket_paths
-from .base import BaseRuntime
+from .base import BaseRuntime, _which
 from .types import ContainerSpec
 
 
 def _can_access_docker_socket() -> bool:
     """Check if Docker socket is accessible without sudo."""
-    for sock_path in get_container_socket_paths(docker_only=True):
-        if sock_path.exists() and os.access(sock_path, os.R_OK | os.W_OK):
-            return True
-    return False
+    return _probe_docker_sockets(tuple(get_container_socket_paths(docker_only=True)))
+
+
+@lru_cache(maxsize=4)
+def _probe_docker_sockets(sock_paths: tuple[Path, ...]) -> bool:
+    """Probe candidate sockets for read/write access (cached per candidate list).
+
+    Permission check only: os.access is one syscall, never connects to the
+    daemon, and is False for missing paths.
+    """
+    return any(os.access(sock_path, os.R_OK | os.W_OK) for sock_path in sock_paths)
 
 
 class DockerRuntime(BaseRuntime):
@@ -25,11 +33,12 @@ class DockerRuntime(BaseRuntime):
     name = "docker"
 
     def __init__(self) -> None:
-        self._use_sudo = False
         self._rootless: bool | None = None  # Lazy-detected
         # Check if we need sudo to access docker socket
-        if not _can_access_docker_socket() and shutil.which("sudo") is not None:
-            self._use_sudo = True
+        socket_ok = _can_access_docker_socket()
+        self._use_sudo = not socket_ok and _which("sudo") is not None
+        # Available if we can access socket directly OR via sudo
+        self._available = _which("docker") is not None and (socket_ok or self._use_sudo)
 
     def _is_rootless(self) -> bool:
         """Detect if Docker is running in rootless mode (cached)."""
@@ -53,10 +62,7 @@ class DockerRuntime(BaseRuntime):
         return ["docker"]
 
     def is_available(self) -> bool:
-        if shutil.which("docker") is None:
-            return False
-        # Available if we can access socket directly OR via sudo
-        return _can_access_docker_socket() or self._use_sudo
+        return self._available
 
     def _add_runtime_specific_flags(self, cmd: list[str], spec: ContainerSpec) -> None:
         pass
@@ -65,6 +71,6 @@ class DockerRuntime(BaseRuntime):
         """Pass host UID/GID and rootful flag for entrypoint user setup."""
         if spec.user:
             uid, gid = spec.user.split(":")
-            cmd.extend(["-e", f"YAAS_HOST_UID={uid}", "-e", f"YAAS_HOST_GID={gid}"])
+            cmd.extend(("-e", f"YAAS_HOST_UID={uid}", "-e", f"YAAS_HOST_GID={gid}"))
         if not self._is_rootless():
-            cmd.extend(["-e", "YAAS_DOCKER_ROOTFUL=1"])
+            cmd.extend(("-e", "YAAS_DOCKER_ROOTFUL=1"))
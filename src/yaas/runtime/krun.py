@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import shutil
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..config import Config
 
 from ..logging import get_logger
+from .base import _which
 from .podman import PodmanRuntime
 from .types import ContainerSpec
 
@@ -25,7 +25,7 @@ class PodmanKrunRuntime(PodmanRuntime):
     name = "podman-krun"
 
     def is_available(self) -> bool:
-        return super().is_available() and shutil.which("krun") is not None
+        return super().is_available() and _which("krun") is not None
 
     # Features incompatible with libkrun MicroVMs (host sockets, FUSE mounts, etc.)
     _INCOMPATIBLE_FEATURES: dict[str, str] = {
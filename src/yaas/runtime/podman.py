@@ -2,10 +2,8 @@
 
 from __future__ import annotations
 
-import shutil
-
 from ..platform import is_linux
-from .base import BaseRuntime
+from .base import BaseRuntime, _which
 from .types import ContainerSpec
 
 
@@ -26,7 +24,7 @@ class PodmanRuntime(BaseRuntime):
         # Podman only supported on Linux
         if not is_linux():
             return False
-        return shutil.which("podman") is not None
+        return _which("podman") is not None
 
     def _add_userns_flags(self, cmd: list[str], spec: ContainerSpec) -> None:
         """No userns — rootless podman maps container UID 0 -> host UID."""
@@ -39,4 +37,4 @@ class PodmanRuntime(BaseRuntime):
         """Pass host UID/GID for entrypoint user setup."""
         if spec.user:
             uid, gid = spec.user.split(":")
-            cmd.extend(["-e", f"YAAS_HOST_UID={uid}", "-e", f"YAAS_HOST_GID={gid}"])
+            cmd.extend(("-e", f"YAAS_HOST_UID={uid}", "-e", f"YAAS_HOST_GID={gid}"))
@@ -9,7 +9,7 @@ if TYPE_CHECKING:
     from ..config import Config
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Mount:
     """Container mount specification."""
 
@@ -35,7 +35,12 @@ def _format_mount(m: Mount) -> str:
     return ",".join(parts)
 
 
-@dataclass
+def _format_env(environment: dict[str, str]) -> list[str]:
+    """Format environment as -e KEY=VALUE argument pairs (shared by run and exec)."""
+    return [arg for key, value in environment.items() for arg in ("-e", f"{key}={value}")]
+
+
+@dataclass(slots=True, frozen=True)
 class ContainerSpec:
     """Full container run specification."""
 
@@ -86,7 +91,7 @@ class ContainerSpec:
     seccomp_profile: str | None = None  # path to seccomp JSON profile
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecSpec:
     """Specification for exec-ing into a running container."""
 
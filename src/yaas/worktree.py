@@ -5,23 +5,52 @@ from __future__ import annotations
 import hashlib
 import os
 import subprocess
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .constants import WORKTREES_DIR
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Porcelain line label -> worktree dict key (other labels, e.g. locked, are ignored)
+_PORCELAIN_KEYS = {
+    b"worktree": "path",
+    b"HEAD": "head",
+    b"branch": "branch",
+    b"bare": "bare",
+    b"detached": "detached",
+}
+
+# Characters Go's encoding/json (docker, podman) escapes inside strings
+_JSON_ESCAPED_CHARS = frozenset('"\\<>&')
+
 
 class WorktreeError(Exception):
     """Error during worktree operation."""
 
 
+@lru_cache(maxsize=32)
+def _rev_parse(option: str, cwd: str) -> str:
+    """Run 'git rev-parse <option>' in cwd (cached per directory).
+
+    cwd must be absolute so a cached entry keeps meaning the same directory
+    after a chdir. Failures raise and are therefore never cached.
+    """
+    cmd = ["git", "rev-parse", option]
+    result = subprocess.run(cmd, capture_output=True, cwd=cwd)
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace").strip()
+        raise WorktreeError(f"Not a git repository: {stderr}")
+    # Decode the path with the filesystem encoding so non-UTF-8 paths round-trip
+    return os.fsdecode(result.stdout.rstrip(b"\n"))
+
+
 def get_git_root(project_dir: Path | None = None) -> Path:
     """Get the root directory of the git repository (or worktree)."""
-    cmd = ["git", "rev-parse", "--show-toplevel"]
-    cwd = str(project_dir) if project_dir else None
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
-    if result.returncode != 0:
-        raise WorktreeError(f"Not a git repository: {result.stderr.strip()}")
-    return Path(result.stdout.strip())
+    cwd = os.path.abspath(project_dir or os.curdir)
+    return Path(_rev_parse("--show-toplevel", cwd))
 
 
 def get_main_repo_root(project_dir: Path | None = None) -> Path:
@@ -30,24 +59,28 @@ def get_main_repo_root(project_dir: Path | None = None) -> Path:
     For a worktree, this returns the main repo that contains the shared .git directory.
     For a main repo, this returns the same as get_git_root.
     """
-    cmd = ["git", "rev-parse", "--git-common-dir"]
-    cwd = str(project_dir) if project_dir else None
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
-    if result.returncode != 0:
-        raise WorktreeError(f"Not a git repository: {result.stderr.strip()}")
+    cwd = os.path.abspath(project_dir or os.curdir)
     # --git-common-dir returns the .git directory, parent is the repo root
-    git_common_dir = Path(result.stdout.strip())
+    git_common_dir = Path(_rev_parse("--git-common-dir", cwd))
     # Handle both absolute and relative paths
     if not git_common_dir.is_absolute():
-        git_common_dir = (Path(cwd) / git_common_dir).resolve() if cwd else git_common_dir.resolve()
+        git_common_dir = (Path(cwd) / git_common_dir).resolve()
     return git_common_dir.parent
 
 
+@lru_cache(maxsize=128)
+def _path_hash(path: str) -> str:
+    """SHA256 hash of a path string, first 12 chars.
+
+    The digest names directories on disk under WORKTREES_DIR, so changing the
+    algorithm would orphan every existing worktree directory.
+    """
+    return hashlib.sha256(path.encode()).hexdigest()[:12]
+
+
 def get_project_hash(project_dir: Path | None = None) -> str:
     """SHA256 hash of git repo root, first 12 chars."""
-    git_root = get_git_root(project_dir)
-    hash_digest = hashlib.sha256(str(git_root).encode()).hexdigest()
-    return hash_digest[:12]
+    return _path_hash(str(get_git_root(project_dir)))
 
 
 def get_worktree_base_dir(
@@ -68,8 +101,7 @@ def get_worktree_base_dir(
         return Path(env_override)
     if main_repo is None:
         main_repo = get_main_repo_root(project_dir)
-    hash_digest = hashlib.sha256(str(main_repo).encode()).hexdigest()[:12]
-    return WORKTREES_DIR / hash_digest
+    return WORKTREES_DIR / _path_hash(str(main_repo))
 
 
 def add_worktree(name: str, branch: str | None = None, project_dir: Path | None = None) -> Path:
@@ -90,49 +122,45 @@ def add_worktree(name: str, branch: str | None = None, project_dir: Path | None
         cmd.append("HEAD")
 
     cwd = str(project_dir) if project_dir else None
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    result = subprocess.run(cmd, capture_output=True, encoding="utf-8", errors="replace", cwd=cwd)
     if result.returncode != 0:
         raise WorktreeError(f"Failed to create worktree: {result.stderr.strip()}")
 
     return worktree_path
 
 
-def list_worktrees(project_dir: Path | None = None) -> list[dict[str, str]]:
-    """Parse 'git worktree list --porcelain' output.
+def iter_worktrees(project_dir: Path | None = None) -> Iterator[dict[str, str]]:
+    """Parse 'git worktree list --porcelain' output lazily, one worktree at a time.
 
-    Returns list of dicts with keys: path, head, branch (optional)
+    Yields dicts with keys: path, head, branch (optional)
     """
     cmd = ["git", "worktree", "list", "--porcelain"]
     cwd = str(project_dir) if project_dir else None
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    # Parse raw bytes; fields are decoded individually with the filesystem
+    # encoding so non-UTF-8 worktree paths round-trip.
+    result = subprocess.run(cmd, capture_output=True, cwd=cwd)
     if result.returncode != 0:
-        raise WorktreeError(f"Failed to list worktrees: {result.stderr.strip()}")
+        stderr = result.stderr.decode(errors="replace").strip()
+        raise WorktreeError(f"Failed to list worktrees: {stderr}")
 
-    worktrees = []
-    current: dict[str, str] = {}
+    for record in result.stdout.split(b"\n\n"):
+        current: dict[str, str] = {}
+        for line in record.split(b"\n"):
+            label, sep, value = line.partition(b" ")
+            key = _PORCELAIN_KEYS.get(label)
+            if key is not None:
+                # Attribute lines carry a value; bare flag lines are just the label
+                current[key] = os.fsdecode(value) if sep else "true"
+        if current:
+            yield current
 
-    for line in result.stdout.splitlines():
-        if not line:
-            if current:
-                worktrees.append(current)
-                current = {}
-            continue
 
-        if line.startswith("worktree "):
-            current["path"] = line[9:]
-        elif line.startswith("HEAD "):
-            current["head"] = line[5:]
-        elif line.startswith("branch "):
-            current["branch"] = line[7:]
-        elif line == "bare":
-            current["bare"] = "true"
-        elif line == "detached":
-            current["detached"] = "true"
-
-    if current:
-        worktrees.append(current)
+def list_worktrees(project_dir: Path | None = None) -> list[dict[str, str]]:
+    """Parse 'git worktree list --porcelain' output.
 
-    return worktrees
+    Returns list of dicts with keys: path, head, branch (optional)
+    """
+    return list(iter_worktrees(project_dir))
 
 
 def remove_worktree(name: str, force: bool = False, project_dir: Path | None = None) -> None:
@@ -147,7 +175,7 @@ def remove_worktree(name: str, force: bool = False, project_dir: Path | None = N
     cmd.append(str(worktree_path))
 
     cwd = str(project_dir) if project_dir else None
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    result = subprocess.run(cmd, capture_output=True, encoding="utf-8", errors="replace", cwd=cwd)
     if result.returncode != 0:
         raise WorktreeError(f"Failed to remove worktree: {result.stderr.strip()}")
 
@@ -160,12 +188,14 @@ def get_worktree_path(name: str, project_dir: Path | None = None) -> Path | None
     base_dir = get_worktree_base_dir(project_dir).resolve()
     expected_path = base_dir / name
 
-    worktrees = list_worktrees(project_dir)
-    for wt in worktrees:
-        if Path(wt["path"]).resolve() == expected_path:
-            return Path(wt["path"])
-
-    return None
+    return next(
+        (
+            Path(wt["path"])
+            for wt in iter_worktrees(project_dir)
+            if Path(wt["path"]).resolve() == expected_path
+        ),
+        None,
+    )
 
 
 def repair_worktrees(project_dir: Path | None = None) -> list[str]:
@@ -174,7 +204,7 @@ def repair_worktrees(project_dir: Path | None = None) -> list[str]:
     1. Get worktree paths from 'git worktree list --porcelain'
     2. Check if any are under old hash dir in WORKTREES_DIR
     3. Move to new hash dir
-    4. Run 'git worktree repair'
+    4. Run a single 'git worktree repair' with the moved paths
 
     Returns list of messages describing actions taken.
     """
@@ -184,7 +214,9 @@ def repair_worktrees(project_dir: Path | None = None) -> list[str]:
     worktrees_dir_resolved = WORKTREES_DIR.resolve()
 
     # Get current worktrees from git (it still knows about them even if paths changed)
-    worktrees = list_worktrees(project_dir)
+    worktrees = iter_worktrees(project_dir)
+
+    moved: list[Path] = []
 
     # Find worktrees that are in WORKTREES_DIR but under a different hash
     for wt in worktrees:
@@ -216,12 +248,13 @@ def repair_worktrees(project_dir: Path | None = None) -> list[str]:
         if old_path.exists():
             current_base.mkdir(parents=True, exist_ok=True)
             old_path.rename(new_path)
+            moved.append(new_path)
             messages.append(f"Moved worktree '{worktree_name}' from {old_hash} to {current_hash}")
 
-    # Run git worktree repair to fix internal pointers
-    cmd = ["git", "worktree", "repair"]
+    # Run git worktree repair once for all moved worktrees to fix internal pointers
+    cmd = ["git", "worktree", "repair", *map(str, moved)]
     cwd = str(project_dir) if project_dir else None
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    result = subprocess.run(cmd, capture_output=True, encoding="utf-8", errors="replace", cwd=cwd)
 
     if result.returncode != 0:
         raise WorktreeError(f"Failed to repair worktrees: {result.stderr.strip()}")
@@ -231,26 +264,37 @@ def repair_worktrees(project_dir: Path | None = None) -> list[str]:
 
     # Clean up empty old hash directories
     if worktrees_dir_resolved.exists():
-        for hash_dir in worktrees_dir_resolved.iterdir():
-            if hash_dir.is_dir() and hash_dir.name != current_hash:
-                # Check if directory is empty
-                if not any(hash_dir.iterdir()):
-                    hash_dir.rmdir()
-                    messages.append(f"Removed empty directory for old hash {hash_dir.name}")
+        # scandir reports entry types without a stat() per hash directory
+        with os.scandir(worktrees_dir_resolved) as entries:
+            old_dirs = [
+                entry.path
+                for entry in entries
+                if entry.name != current_hash and entry.is_dir(follow_symlinks=False)
+            ]
+        for hash_dir in old_dirs:
+            if _is_empty_dir(hash_dir):
+                os.rmdir(hash_dir)
+                messages.append(
+                    f"Removed empty directory for old hash {os.path.basename(hash_dir)}"
+                )
 
     return messages
 
 
+def _is_empty_dir(path: str) -> bool:
+    """Check whether a directory has no entries, reading at most one."""
+    with os.scandir(path) as entries:
+        return next(entries, None) is None
+
+
 def get_yaas_worktrees(project_dir: Path | None = None) -> list[dict[str, str]]:
     """Get worktrees that are managed by YAAS (under WORKTREES_DIR).
 
     Returns list of dicts with keys: name, path, head, branch (optional)
     """
     base_dir = get_worktree_base_dir(project_dir).resolve()
-    all_worktrees = list_worktrees(project_dir)
-
     yaas_worktrees = []
-    for wt in all_worktrees:
+    for wt in iter_worktrees(project_dir):
         wt_path = Path(wt["path"]).resolve()
         if str(wt_path).startswith(str(base_dir)):
             # Extract worktree name from path
@@ -265,22 +309,43 @@ def check_worktree_in_use(worktree_path: Path, command_prefix: list[str]) -> boo
 
     Queries the container runtime to check if any container has the worktree path mounted.
     """
+    return _worktree_in_containers(worktree_path, _fetch_running_containers(command_prefix))
+
+
+def _fetch_running_containers(command_prefix: list[str]) -> bytes:
+    """Return the runtime's 'ps --format json' output, or b"" if it can't be queried."""
     cmd = [*command_prefix, "ps", "--format", "json"]
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, capture_output=True)
 
     if result.returncode != 0:
         # Runtime might not be available, can't check
-        return False
+        return b""
+    return result.stdout
+
+
+def _worktree_in_containers(worktree_path: Path, ps_output: bytes) -> bool:
+    """Check whether any container in raw 'ps --format json' output mounts the worktree."""
+    # Runtimes report absolute host paths; resolve once so relative or
+    # symlinked inputs compare against the same form
+    worktree_str = os.fspath(worktree_path.resolve())
+    # Cheap pre-check on the raw output: a path with no characters that JSON
+    # encoders may escape must appear verbatim if any mount references it.
+    if (
+        worktree_str.isascii()
+        and worktree_str.isprintable()
+        and not _JSON_ESCAPED_CHARS.intersection(worktree_str)
+    ):
+        if worktree_str.encode() not in ps_output:
+            return False
 
     import json
 
     try:
         # podman ps --format json returns a JSON array
-        containers = json.loads(result.stdout) if result.stdout.strip() else []
+        containers = json.loads(ps_output) if ps_output.strip() else []
     except json.JSONDecodeError:
         return False
 
-    worktree_str = str(worktree_path)
     for container in containers:
         # Check Mounts field for podman/docker
         mounts = container.get("Mounts", [])
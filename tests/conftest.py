@@ -1,14 +1,45 @@
 """Pytest configuration and fixtures."""
 
 import os
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+import yaas.platform
+import yaas.runtime.base
+import yaas.runtime.docker
+import yaas.worktree
+from yaas.config import Config
+
+# ============================================================
+# Host state isolation
+# ============================================================
+
+
+@pytest.fixture(scope="session")
+def _config_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Provide a per-session stand-in for the yaas config dir."""
+    return tmp_path_factory.mktemp("config")
+
+
+@pytest.fixture(autouse=True)
+def _clear_host_caches() -> None:
+    """Make every test probe the (mocked) host afresh despite the platform/PATH caches."""
+    yaas.platform._clear_caches()
+    yaas.runtime.base._which.cache_clear()
+    yaas.runtime.docker._probe_docker_sockets.cache_clear()
+    yaas.worktree._rev_parse.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_mise_config(_config_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep spec builders from creating mise.toml in the real user config dir."""
+    monkeypatch.setattr("yaas.container.MISE_CONFIG_PATH", _config_dir / "mise.toml")
+
+
 # ============================================================
 # Platform mocking fixtures
 # ============================================================
@@ -61,17 +92,75 @@ def mock_other_platform() -> Generator[None, None, None]:
         yield
 
 
+# ============================================================
+# Runtime fixtures
+# ============================================================
+
+
+@pytest.fixture
+def linux_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make the Podman runtimes see a Linux host (no MagicMock involved)."""
+    monkeypatch.setattr("yaas.runtime.podman.is_linux", lambda: True)
+
+
+@pytest.fixture
+def docker_socket_accessible(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make the Docker socket accessible so DockerRuntime runs without sudo."""
+    monkeypatch.setattr("yaas.runtime.docker._can_access_docker_socket", lambda: True)
+
+
+@pytest.fixture
+def docker_socket_sudo(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make the Docker socket inaccessible with docker and sudo on PATH."""
+    binaries = {"docker": "/usr/bin/docker", "sudo": "/usr/bin/sudo"}
+    monkeypatch.setattr("yaas.runtime.docker._can_access_docker_socket", lambda: False)
+    monkeypatch.setattr("shutil.which", lambda cmd, *args, **kwargs: binaries.get(cmd))
+
+
+@pytest.fixture
+def mock_subprocess_run(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace subprocess.run with a mock that succeeds by default."""
+    mock_run = MagicMock(return_value=MagicMock(returncode=0))
+    monkeypatch.setattr("subprocess.run", mock_run)
+    return mock_run
+
+
 # ============================================================
 # Environment fixtures
 # ============================================================
 
 
 @pytest.fixture
-def clean_env() -> Generator[dict[str, str], None, None]:
-    """Provide a clean environment with only basic variables."""
+def clean_env(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    """Provide a clean environment with only basic variables.
+
+    Backed by monkeypatch like ``env``, so every environment change in a test
+    shares one undo stack and ``env(...)`` layered on top is restored correctly.
+    """
     clean = {"USER": "testuser"}
-    with patch.dict(os.environ, clean, clear=True):
-        yield clean
+    for name in list(os.environ):
+        monkeypatch.delenv(name)
+    for name, value in clean.items():
+        monkeypatch.setenv(name, value)
+    return clean
+
+
+@pytest.fixture
+def env(monkeypatch: pytest.MonkeyPatch) -> Callable[..., None]:
+    """Set environment variables for the current test; a value of None unsets it.
+
+    Backed by monkeypatch, so teardown restores only the variables that were
+    touched instead of snapshotting and restoring the whole of os.environ.
+    """
+
+    def _set(**variables: str | None) -> None:
+        for name, value in variables.items():
+            if value is None:
+                monkeypatch.delenv(name, raising=False)
+            else:
+                monkeypatch.setenv(name, value)
+
+    return _set
 
 
 # ============================================================
@@ -79,8 +168,33 @@ def clean_env() -> Generator[dict[str, str], None, None]:
 # ============================================================
 
 
-@pytest.fixture
-def project_dir() -> Generator[Path, None, None]:
-    """Provide a temporary project directory."""
-    with TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+@pytest.fixture(scope="module")
+def project_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Provide a temporary project directory shared by all tests in a module.
+
+    Spec builders only read from the project directory. Tests that create files
+    inside it should use the function-scoped tmp_path instead.
+    """
+    return tmp_path_factory.mktemp("project")
+
+
+@pytest.fixture(scope="session")
+def ssh_socket(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Provide a stand-in SSH agent socket file shared by the whole session."""
+    sock = tmp_path_factory.mktemp("ssh") / "agent"
+    sock.touch()
+    return sock
+
+
+# ============================================================
+# Config fixtures
+# ============================================================
+
+
+@pytest.fixture(scope="module")
+def base_config() -> Config:
+    """Provide a default Config shared by all tests in a module.
+
+    Tests must not mutate it; derive variants with dataclasses.replace instead.
+    """
+    return Config()
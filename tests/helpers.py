@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import sys
 from collections.abc import Generator
-from contextlib import ExitStack, contextmanager
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 import pytest
 
 from yaas.runtime import ContainerSpec, Mount
+from yaas.runtime.base import _which
 
 if TYPE_CHECKING:
     from yaas.config import Config
@@ -51,21 +52,24 @@ def mock_docker_socket(accessible: bool = True) -> Generator[None, None, None]:
 def mock_which(commands: dict[str, str | None]) -> Generator[None, None, None]:
     """Mock shutil.which for specific commands.
 
-    Patches shutil.which in all runtime submodules (podman, docker, krun).
+    Patches shutil.which (shared by all runtime submodules) and clears the
+    runtime _which cache on entry and exit so no stale lookup leaks through.
     """
 
     def which_side_effect(cmd: str) -> str | None:
         return commands.get(cmd)
 
-    with ExitStack() as stack:
-        stack.enter_context(
-            patch("yaas.runtime.podman.shutil.which", side_effect=which_side_effect)
-        )
-        stack.enter_context(
-            patch("yaas.runtime.docker.shutil.which", side_effect=which_side_effect)
-        )
-        stack.enter_context(patch("yaas.runtime.krun.shutil.which", side_effect=which_side_effect))
-        yield
+    _which.cache_clear()
+    try:
+        with patch("yaas.runtime.base.shutil.which", side_effect=which_side_effect):
+            yield
+    finally:
+        _which.cache_clear()
+
+
+def flag_values(cmd: list[str], flag: str) -> list[str]:
+    """Return the argument following each occurrence of ``flag`` in a command line."""
+    return [cmd[i + 1] for i, arg in enumerate(cmd[:-1]) if arg == flag]
 
 
 def make_spec(**overrides: object) -> ContainerSpec:
@@ -85,6 +89,13 @@ def make_spec(**overrides: object) -> ContainerSpec:
     return ContainerSpec(**defaults)  # type: ignore[arg-type]
 
 
+def assert_spec_matches(spec: ContainerSpec, **expected: object) -> None:
+    """Assert that each named ContainerSpec field equals its expected value."""
+    for field, value in expected.items():
+        actual = getattr(spec, field)
+        assert actual == value, f"{field}: {actual!r} != {value!r}"
+
+
 def make_config(**overrides: object) -> Config:
     """Create a Config with sensible defaults for testing."""
     from yaas.config import Config
@@ -94,6 +105,8 @@ def make_config(**overrides: object) -> Config:
 
 __all__ = [
     "Mount",
+    "assert_spec_matches",
+    "flag_values",
     "linux_only",
     "macos_only",
     "make_config",
@@ -6,6 +6,7 @@ from unittest.mock import patch
 
 import pytest
 
+from tests.helpers import assert_spec_matches
 from yaas.config import (
     BoxSpec,
     Config,
@@ -16,7 +17,7 @@ from yaas.config import (
 )
 from yaas.constants import BOX_CONTAINER_PREFIX, RUNTIME_IMAGE
 from yaas.container import build_box_spec
-from yaas.runtime import ContainerSpec, ExecSpec, PodmanRuntime
+from yaas.runtime import ContainerSpec, ExecSpec, Mount, PodmanRuntime
 
 
 @pytest.fixture(autouse=True)
@@ -260,13 +261,16 @@ class TestBuildBoxSpec:
         config = Config(boxes={"shell": BoxSpec()})
         spec = build_box_spec(config, "shell", "yaas-box-mybox")
 
-        assert spec.image == RUNTIME_IMAGE
-        assert spec.name == "yaas-box-mybox"
-        assert spec.entrypoint is None
-        assert spec.command == ["sleep", "infinity"]
-        assert spec.init is True
-        assert spec.tty is False
-        assert spec.stdin_open is False
+        assert_spec_matches(
+            spec,
+            image=RUNTIME_IMAGE,
+            name="yaas-box-mybox",
+            entrypoint=None,
+            command=["sleep", "infinity"],
+            init=True,
+            tty=False,
+            stdin_open=False,
+        )
         assert spec.labels["yaas.box.spec"] == "shell"
 
     def test_custom_command(self, mock_linux, clean_env) -> None:
@@ -285,7 +289,7 @@ class TestBuildBoxSpec:
         config = Config(boxes={"shell": BoxSpec()})
         spec = build_box_spec(config, "shell", "yaas-box-test")
 
-        targets = [m.target for m in spec.mounts]
+        targets = {m.target for m in spec.mounts}
         assert "/home" in targets
         assert "/nix" in targets
 
@@ -295,7 +299,7 @@ class TestBuildBoxSpec:
         spec = build_box_spec(config, "locked", "yaas-box-locked")
 
         volume_mounts = [m for m in spec.mounts if m.type == "volume"]
-        volume_targets = [m.target for m in volume_mounts]
+        volume_targets = {m.target for m in volume_mounts}
         assert "/home" not in volume_targets
         assert "/nix" not in volume_targets
 
@@ -317,6 +321,18 @@ class TestBuildBoxSpec:
         assert spec.cap_drop == ["ALL"]
         assert "CHOWN" in spec.cap_add
 
+    def test_ssh_agent_forwarded(
+        self, mock_linux, clean_env, ssh_socket: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """ssh_agent mounts the agent socket and sets SSH_AUTH_SOCK."""
+        config = Config(boxes={"shell": BoxSpec(ssh_agent=True)})
+
+        monkeypatch.setattr("yaas.container.get_ssh_agent_socket", lambda: ssh_socket)
+        spec = build_box_spec(config, "shell", "yaas-box-test")
+
+        assert Mount(str(ssh_socket), "/ssh-agent") in spec.mounts
+        assert spec.environment["SSH_AUTH_SOCK"] == "/ssh-agent"
+
     def test_resource_limits(self, mock_linux, clean_env) -> None:
         config = Config(
             resources=ResourceLimits(memory="8g", cpus=2.0),
@@ -0,0 +1,43 @@
+"""Tests for CLI container launch flow."""
+
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import typer
+
+from yaas.cli import _run_container
+from yaas.config import Config
+
+
+class TestRunContainer:
+    """Tests for _run_container."""
+
+    def test_sudo_worktree_check_runs_after_preparation(
+        self, monkeypatch: pytest.MonkeyPatch, project_dir: Path
+    ) -> None:
+        """With sudo docker, the in-use check runs after pull/upgrade, on the main thread."""
+        calls: list[tuple[str, threading.Thread]] = []
+
+        def record(name: str, result: object = None) -> MagicMock:
+            def side_effect(*args: object, **kwargs: object) -> object:
+                calls.append((name, threading.current_thread()))
+                return result
+
+            return MagicMock(side_effect=side_effect)
+
+        runtime = MagicMock(command_prefix=["sudo", "docker"])
+        runtime.name = "docker"
+        runtime.run.return_value = 0
+        monkeypatch.setattr("yaas.cli.get_runtime", lambda _name: runtime)
+        monkeypatch.setattr("yaas.cli._pull_image", record("pull", True))
+        monkeypatch.setattr("yaas.cli._upgrade_tools", record("upgrade", True))
+        monkeypatch.setattr("yaas.cli.build_container_spec", MagicMock())
+        monkeypatch.setattr("yaas.cli.check_worktree_in_use", record("ps", False))
+
+        with pytest.raises(typer.Exit):
+            _run_container(Config(), project_dir, ["bash"], worktree_name="feature")
+
+        assert [name for name, _ in calls] == ["pull", "upgrade", "ps"]
+        assert all(thread is threading.main_thread() for _, thread in calls)
@@ -1,10 +1,13 @@
 """Tests for container spec building."""
 
-import os
 from contextlib import ExitStack
+from dataclasses import replace
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import pytest
+
+from tests.helpers import assert_spec_matches
 from yaas.config import Config, ResourceLimits, SecuritySettings, ToolConfig
 from yaas.constants import HOME_VOLUME, NIX_VOLUME, RUNTIME_IMAGE
 from yaas.container import (
@@ -20,29 +23,25 @@ from yaas.worktree import WorktreeError
 class TestBuildContainerSpec:
     """Tests for build_container_spec function."""
 
-    def test_basic(self, mock_linux, project_dir, clean_env) -> None:
+    def test_basic(self, mock_linux, project_dir, clean_env, env, base_config) -> None:
         """Test basic container spec building."""
-        clean_env["TERM"] = "xterm-256color"
-        config = Config()
+        env(TERM="xterm-256color")
 
-        spec = build_container_spec(config, project_dir, ["bash"])
+        spec = build_container_spec(base_config, project_dir, ["bash"])
 
-        assert spec.image == RUNTIME_IMAGE
-        assert spec.command == ["bash"]
-        assert spec.working_dir == str(project_dir)
-        assert spec.tty is True
-        assert spec.stdin_open is True
+        assert_spec_matches(
+            spec,
+            image=RUNTIME_IMAGE,
+            command=["bash"],
+            working_dir=str(project_dir),
+            tty=True,
+            stdin_open=True,
+        )
 
-    def test_environment_variables(self, mock_linux, project_dir) -> None:
+    def test_environment_variables(self, mock_linux, project_dir, env, base_config) -> None:
         """Test environment variables in container spec."""
-        config = Config()
-        env = {
-            "USER": "testuser",
-            "TERM": "xterm-256color",
-            "COLORTERM": "truecolor",
-        }
-        with patch.dict(os.environ, env):
-            spec = build_container_spec(config, project_dir, ["bash"])
+        env(USER="testuser", TERM="xterm-256color", COLORTERM="truecolor")
+        spec = build_container_spec(base_config, project_dir, ["bash"])
 
         assert spec.environment["TERM"] == "xterm-256color"
         assert spec.environment["YAAS"] == "1"
@@ -50,21 +49,19 @@ class TestBuildContainerSpec:
         # API keys are no longer auto-forwarded globally
         assert "ANTHROPIC_API_KEY" not in spec.environment
 
-    def test_network_isolation(self, mock_linux, project_dir, clean_env) -> None:
+    def test_network_isolation(self, mock_linux, project_dir, clean_env, base_config) -> None:
         """Test network isolation setting."""
-        config = Config()
-        config.network_mode = "none"
+        config = replace(base_config, network_mode="none")
 
         spec = build_container_spec(config, project_dir, ["bash"])
 
         assert spec.network_mode == "none"
 
-    def test_resource_limits(self, mock_linux, project_dir, clean_env) -> None:
+    def test_resource_limits(self, mock_linux, project_dir, clean_env, base_config) -> None:
         """Test resource limits are passed through."""
-        config = Config()
-        config.resources.memory = "16g"
-        config.resources.cpus = 4.0
-        config.resources.pids_limit = 500
+        config = replace(
+            base_config, resources=ResourceLimits(memory="16g", cpus=4.0, pids_limit=500)
+        )
 
         spec = build_container_spec(config, project_dir, ["bash"])
 
@@ -72,48 +69,59 @@ class TestBuildContainerSpec:
         assert spec.cpus == 4.0
         assert spec.pids_limit == 500
 
-    def test_home_volume_mounted(self, mock_linux, project_dir, clean_env) -> None:
-        """Test that home volume is mounted at /home for persistence."""
-        config = Config()
+    def test_ssh_agent_forwarded(
+        self,
+        mock_linux,
+        project_dir,
+        clean_env,
+        base_config,
+        ssh_socket: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that the SSH agent socket is mounted and SSH_AUTH_SOCK points at it."""
+        config = replace(base_config, ssh_agent=True)
+
+        monkeypatch.setattr("yaas.container.get_ssh_agent_socket", lambda: ssh_socket)
         spec = build_container_spec(config, project_dir, ["bash"])
+
+        assert Mount(str(ssh_socket), "/ssh-agent") in spec.mounts
+        assert spec.environment["SSH_AUTH_SOCK"] == "/ssh-agent"
+
+    def test_home_volume_mounted(self, mock_linux, project_dir, clean_env, base_config) -> None:
+        """Test that home volume is mounted at /home for persistence."""
+        spec = build_container_spec(base_config, project_dir, ["bash"])
         home_mount = next(
             (m for m in spec.mounts if m.target == "/home" and m.type == "volume"), None
         )
         assert home_mount is not None
         assert home_mount.source == HOME_VOLUME
 
-    def test_nix_volume_mounted(self, mock_linux, project_dir, clean_env) -> None:
+    def test_nix_volume_mounted(self, mock_linux, project_dir, clean_env, base_config) -> None:
         """Test that Nix volume is mounted for package persistence."""
-        config = Config()
-        spec = build_container_spec(config, project_dir, ["bash"])
+        spec = build_container_spec(base_config, project_dir, ["bash"])
         nix_mount = next(
             (m for m in spec.mounts if m.target == "/nix" and m.type == "volume"), None
         )
         assert nix_mount is not None
         assert nix_mount.source == NIX_VOLUME
 
-    def test_run_tmpfs_mounted(self, mock_linux, project_dir, clean_env) -> None:
+    def test_run_tmpfs_mounted(self, mock_linux, project_dir, clean_env, base_config) -> None:
         """Test that /run is mounted as tmpfs for fresh runtime state on every start."""
-        config = Config()
-        spec = build_container_spec(config, project_dir, ["bash"])
+        spec = build_container_spec(base_config, project_dir, ["bash"])
         run_mount = next(
             (m for m in spec.mounts if m.target == "/run" and m.type == "tmpfs"), None
         )
         assert run_mount is not None
 
-    def test_no_passwd_mount_on_linux(self, mock_linux, project_dir, clean_env) -> None:
+    @pytest.mark.parametrize("platform_fixture", ["mock_linux", "mock_macos"])
+    def test_no_passwd_mount(
+        self, request: pytest.FixtureRequest, platform_fixture: str, project_dir, clean_env
+    ) -> None:
         """Test that /etc/passwd and /etc/group are not mounted (user created in entrypoint)."""
+        request.getfixturevalue(platform_fixture)
         config = Config()
         spec = build_container_spec(config, project_dir, ["bash"])
-        mount_sources = [m.source for m in spec.mounts]
-        assert "/etc/passwd" not in mount_sources
-        assert "/etc/group" not in mount_sources
-
-    def test_no_passwd_mount_on_macos(self, mock_macos, project_dir, clean_env) -> None:
-        """Test that /etc/passwd and /etc/group are not mounted on macOS."""
-        config = Config()
-        spec = build_container_spec(config, project_dir, ["bash"])
-        mount_sources = [m.source for m in spec.mounts]
+        mount_sources = {m.source for m in spec.mounts}
         assert "/etc/passwd" not in mount_sources
         assert "/etc/group" not in mount_sources
 
@@ -193,7 +201,7 @@ class TestParseMountSpecMissing:
         with patch("yaas.container.Path.expanduser", return_value=nonexistent):
             spec = build_container_spec(config, tmp_path, ["bash"])
 
-        targets = [m.target for m in spec.mounts]
+        targets = {m.target for m in spec.mounts}
         assert "/home/.yaas_nonexistent_test_path" not in targets
 
 
@@ -337,35 +345,45 @@ class TestParseMountSpecExtended:
         )
         assert result is None
 
-    def test_aliases_source_destination(self) -> None:
-        """source/destination aliases work."""
-        mount = _parse_mount_spec(
-            "type=volume,source=my-vol,destination=/mnt", Path("/project")
-        )
+    @pytest.mark.parametrize(
+        ("spec", "source", "target"),
+        [
+            pytest.param(
+                "type=volume,source=my-vol,destination=/mnt",
+                "my-vol",
+                "/mnt",
+                id="source-destination",
+            ),
+            pytest.param("type=volume,src=vol,target=/mnt", "vol", "/mnt", id="target"),
+        ],
+    )
+    def test_key_aliases(self, spec: str, source: str, target: str) -> None:
+        """source/destination/target aliases work."""
+        mount = _parse_mount_spec(spec, Path("/project"))
         assert mount is not None
-        assert mount.source == "my-vol"
-        assert mount.target == "/mnt"
+        assert mount.source == source
+        assert mount.target == target
 
-    def test_alias_target(self) -> None:
-        """target alias works for destination."""
-        mount = _parse_mount_spec("type=volume,src=vol,target=/mnt", Path("/project"))
-        assert mount is not None
-        assert mount.target == "/mnt"
+    @pytest.mark.parametrize(
+        "spec",
+        [
+            pytest.param("type=volume,src=name", id="missing-dst"),
+            pytest.param("src=name,dst=/data", id="missing-type"),
+            pytest.param("type=nfs,src=name,dst=/data", id="unknown-type"),
+        ],
+    )
+    def test_invalid_spec_returns_none(self, spec: str) -> None:
+        """Missing destination, missing type or unknown type returns None."""
+        assert _parse_mount_spec(spec, Path("/project")) is None
 
-    def test_missing_dst_returns_none(self) -> None:
-        """Missing destination returns None."""
-        result = _parse_mount_spec("type=volume,src=name", Path("/project"))
-        assert result is None
 
-    def test_missing_type_returns_none(self) -> None:
-        """Missing type returns None."""
-        result = _parse_mount_spec("src=name,dst=/data", Path("/project"))
-        assert result is None
+def _make_mock_path(x11_socket: Path) -> MagicMock:
+    """Build a stand-in for yaas.container.Path that redirects the X11 socket dir."""
 
-    def test_unknown_type_returns_none(self) -> None:
-        """Unknown mount type returns None."""
-        result = _parse_mount_spec("type=nfs,src=name,dst=/data", Path("/project"))
-        assert result is None
+    def side_effect(arg: str) -> Path:
+        return x11_socket if arg == "/tmp/.X11-unix" else Path(arg)
+
+    return MagicMock(side_effect=side_effect, home=Path.home)
 
 
 class TestClipboardSupport:
@@ -375,24 +393,19 @@ class TestClipboardSupport:
     so they run on any CI platform regardless of the host OS.
     """
 
-    def test_wayland_support(self, mock_linux, project_dir) -> None:
+    def test_wayland_support(self, mock_linux, tmp_path: Path, clean_env, env) -> None:
         """Test clipboard support with Wayland display."""
         config = Config()
         config.clipboard = True
 
         # Create wayland socket in temp directory
-        runtime_dir = project_dir / "runtime"
+        runtime_dir = tmp_path / "runtime"
         runtime_dir.mkdir()
         wayland_socket = runtime_dir / "wayland-0"
         wayland_socket.touch()
 
-        env = {
-            "USER": "testuser",
-            "WAYLAND_DISPLAY": "wayland-0",
-            "XDG_RUNTIME_DIR": str(runtime_dir),
-        }
-        with patch.dict(os.environ, env, clear=True):
-            spec = build_container_spec(config, project_dir, ["bash"])
+        env(USER="testuser", WAYLAND_DISPLAY="wayland-0", XDG_RUNTIME_DIR=str(runtime_dir))
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
         # Check WAYLAND_DISPLAY is forwarded but XDG_RUNTIME_DIR is not
         # (entrypoint sets XDG_RUNTIME_DIR for the container's SHELL_UID)
@@ -400,31 +413,24 @@ class TestClipboardSupport:
         assert "XDG_RUNTIME_DIR" not in spec.environment
 
         # Check wayland socket is mounted into /run/host/ staging area
-        mount_targets = [m.target for m in spec.mounts]
+        mount_targets = {m.target for m in spec.mounts}
         assert "/run/host/wayland-0" in mount_targets
 
-    def test_x11_fallback(self, mock_linux, project_dir) -> None:
+    def test_x11_fallback(
+        self, mock_linux, tmp_path: Path, clean_env, env, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Test clipboard support with X11 display (fallback when no Wayland)."""
         config = Config()
         config.clipboard = True
 
-        x11_socket = project_dir / ".X11-unix"
+        x11_socket = tmp_path / ".X11-unix"
         x11_socket.mkdir()
 
-        env = {"USER": "testuser", "DISPLAY": ":0"}
+        env(DISPLAY=":0")
 
         # Mock the X11 socket path check
-        real_path = Path
-
-        def mock_path_side_effect(arg: str) -> Path:
-            return x11_socket if arg == "/tmp/.X11-unix" else real_path(arg)
-
-        with ExitStack() as stack:
-            stack.enter_context(patch.dict(os.environ, env, clear=True))
-            mock_path = stack.enter_context(patch("yaas.container.Path"))
-            mock_path.side_effect = mock_path_side_effect
-            mock_path.home = real_path.home
-            spec = build_container_spec(config, project_dir, ["bash"])
+        monkeypatch.setattr("yaas.container.Path", _make_mock_path(x11_socket))
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
         assert spec.environment.get("DISPLAY") == ":0"
 
@@ -438,65 +444,73 @@ class TestClipboardSupport:
         assert "WAYLAND_DISPLAY" not in spec.environment
         assert "DISPLAY" not in spec.environment
 
-    def test_disabled_no_mounts(self, mock_linux, project_dir) -> None:
+    def test_disabled_no_mounts(self, mock_linux, tmp_path: Path, env) -> None:
         """Test that display mounts are not added when clipboard is disabled."""
         config = Config()
         config.clipboard = False
 
-        runtime_dir = project_dir / "runtime"
+        runtime_dir = tmp_path / "runtime"
         runtime_dir.mkdir()
 
-        env = {
-            "USER": "testuser",
-            "WAYLAND_DISPLAY": "wayland-0",
-            "XDG_RUNTIME_DIR": str(runtime_dir),
-            "DISPLAY": ":0",
-        }
-        with patch.dict(os.environ, env):
-            spec = build_container_spec(config, project_dir, ["bash"])
+        env(
+            USER="testuser",
+            WAYLAND_DISPLAY="wayland-0",
+            XDG_RUNTIME_DIR=str(runtime_dir),
+            DISPLAY=":0",
+        )
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
         # Display env vars should NOT be forwarded when clipboard is disabled
         assert "WAYLAND_DISPLAY" not in spec.environment
         assert "DISPLAY" not in spec.environment
 
         # No host sockets should be mounted
-        mount_targets = [m.target for m in spec.mounts]
+        mount_targets = {m.target for m in spec.mounts}
         assert "/run/host/wayland-0" not in mount_targets
 
-    def test_non_linux_silently_skipped(self, mock_macos, project_dir) -> None:
+    def test_non_linux_silently_skipped(self, mock_macos, tmp_path: Path, env) -> None:
         """Test that clipboard is silently skipped on non-Linux."""
         config = Config()
         config.clipboard = True
 
-        runtime_dir = project_dir / "runtime"
+        runtime_dir = tmp_path / "runtime"
         runtime_dir.mkdir()
 
-        env = {
-            "USER": "testuser",
-            "WAYLAND_DISPLAY": "wayland-0",
-            "XDG_RUNTIME_DIR": str(runtime_dir),
-            "DISPLAY": ":0",
-        }
-        with patch.dict(os.environ, env):
-            spec = build_container_spec(config, project_dir, ["bash"])
+        env(
+            USER="testuser",
+            WAYLAND_DISPLAY="wayland-0",
+            XDG_RUNTIME_DIR=str(runtime_dir),
+            DISPLAY=":0",
+        )
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
         # Display env vars should NOT be forwarded on non-Linux
         assert "WAYLAND_DISPLAY" not in spec.environment
         assert "DISPLAY" not in spec.environment
 
         # No host sockets should be mounted
-        mount_targets = [m.target for m in spec.mounts]
+        mount_targets = {m.target for m in spec.mounts}
         assert "/run/host/wayland-0" not in mount_targets
 
 
+@pytest.fixture
+def wt_tmp(request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Per-test temp dir named after the test.
+
+    Worktree test names are unique within this module, so the directory can be
+    created directly instead of probing for the next free numbered suffix.
+    """
+    return tmp_path_factory.mktemp(request.node.name, numbered=False)
+
+
 class TestWorktreeMounts:
     """Tests for worktree mount logic in _add_worktree_mounts."""
 
-    def test_worktree_base_mounted_when_exists(self, tmp_path: Path) -> None:
+    def test_worktree_base_mounted_when_exists(self, wt_tmp: Path) -> None:
         """Normal session: worktree base dir is mounted when it exists."""
-        git_root = tmp_path / "repo"
+        git_root = wt_tmp / "repo"
         git_root.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         project_dir = git_root
 
@@ -513,11 +527,11 @@ class TestWorktreeMounts:
         assert wt_mount.target == str(wt_base)
         assert wt_mount.read_only is False
 
-    def test_worktree_base_created_when_missing(self, tmp_path: Path) -> None:
+    def test_worktree_base_created_when_missing(self, wt_tmp: Path) -> None:
         """Normal session: worktree base dir is created and mounted when missing."""
-        git_root = tmp_path / "repo"
+        git_root = wt_tmp / "repo"
         git_root.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"  # Not created yet
+        wt_base = wt_tmp / "worktrees" / "abc123"  # Not created yet
         project_dir = git_root
 
         mounts: list[Mount] = []
@@ -532,11 +546,11 @@ class TestWorktreeMounts:
         wt_mount = next((m for m in mounts if m.source == str(wt_base)), None)
         assert wt_mount is not None
 
-    def test_normal_session_wt_base_always_rw(self, tmp_path: Path) -> None:
+    def test_normal_session_wt_base_always_rw(self, wt_tmp: Path) -> None:
         """Normal session: worktree base is always RW regardless of read_only flag."""
-        git_root = tmp_path / "repo"
+        git_root = wt_tmp / "repo"
         git_root.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         project_dir = git_root
 
@@ -551,11 +565,11 @@ class TestWorktreeMounts:
         assert wt_mount is not None
         assert wt_mount.read_only is False
 
-    def test_worktree_session_mounts_main_repo(self, tmp_path: Path) -> None:
+    def test_worktree_session_mounts_main_repo(self, wt_tmp: Path) -> None:
         """Worktree session: main repo is mounted."""
-        main_repo = tmp_path / "repo"
+        main_repo = wt_tmp / "repo"
         main_repo.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         project_dir = wt_base / "feature-branch"
         project_dir.mkdir()
@@ -572,11 +586,11 @@ class TestWorktreeMounts:
         assert repo_mount.target == str(main_repo)
         assert repo_mount.read_only is False
 
-    def test_worktree_session_mounts_wt_base(self, tmp_path: Path) -> None:
+    def test_worktree_session_mounts_wt_base(self, wt_tmp: Path) -> None:
         """Worktree session: worktree base dir is mounted read-write."""
-        main_repo = tmp_path / "repo"
+        main_repo = wt_tmp / "repo"
         main_repo.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         project_dir = wt_base / "feature-branch"
         project_dir.mkdir()
@@ -593,11 +607,11 @@ class TestWorktreeMounts:
         assert wt_mount.target == str(wt_base)
         assert wt_mount.read_only is False
 
-    def test_worktree_session_skips_project_mount(self, tmp_path: Path) -> None:
+    def test_worktree_session_skips_project_mount(self, wt_tmp: Path) -> None:
         """Worktree session: returns True to skip the project_dir mount."""
-        main_repo = tmp_path / "repo"
+        main_repo = wt_tmp / "repo"
         main_repo.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         project_dir = wt_base / "feature-branch"
         project_dir.mkdir()
@@ -613,11 +627,11 @@ class TestWorktreeMounts:
         project_mount = next((m for m in mounts if m.source == str(project_dir)), None)
         assert project_mount is None
 
-    def test_worktree_session_readonly_applies_to_main_repo(self, tmp_path: Path) -> None:
+    def test_worktree_session_readonly_applies_to_main_repo(self, wt_tmp: Path) -> None:
         """Worktree session: read_only applies to main repo, wt_base is always RW."""
-        main_repo = tmp_path / "repo"
+        main_repo = wt_tmp / "repo"
         main_repo.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         project_dir = wt_base / "feature-branch"
         project_dir.mkdir()
@@ -639,28 +653,28 @@ class TestWorktreeMounts:
         assert repo_mount is not None
         assert repo_mount.read_only is True
 
-    def test_not_a_git_repo(self, tmp_path: Path) -> None:
+    def test_not_a_git_repo(self, wt_tmp: Path) -> None:
         """Non-git directory: no worktree mounts added."""
         mounts: list[Mount] = []
         with patch(
             "yaas.container.get_main_repo_root",
             side_effect=WorktreeError("Not a git repository"),
         ):
-            skip = _add_worktree_mounts(mounts, tmp_path, read_only=False)
+            skip = _add_worktree_mounts(mounts, wt_tmp, read_only=False)
 
         assert skip is False
         assert len(mounts) == 0
 
-    def test_symlinked_worktree_detected(self, tmp_path: Path) -> None:
+    def test_symlinked_worktree_detected(self, wt_tmp: Path) -> None:
         """Worktree session detected even when project_dir is accessed via symlink."""
-        main_repo = tmp_path / "repo"
+        main_repo = wt_tmp / "repo"
         main_repo.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         real_dir = wt_base / "feature-branch"
         real_dir.mkdir()
         # Access worktree through a symlink
-        symlink_dir = tmp_path / "linked-worktree"
+        symlink_dir = wt_tmp / "linked-worktree"
         symlink_dir.symlink_to(real_dir)
 
         mounts: list[Mount] = []
@@ -694,12 +708,12 @@ class TestWorktreeMountsIntegration:
         stack.enter_context(patch("yaas.container.get_worktree_base_dir", return_value=wt_base))
         return stack
 
-    def test_worktree_session_full_spec(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_worktree_session_full_spec(self, mock_linux, clean_env, wt_tmp: Path) -> None:
         """Worktree session: build_container_spec includes main repo and wt_base,
         but not project_dir as a separate mount."""
-        main_repo = tmp_path / "repo"
+        main_repo = wt_tmp / "repo"
         main_repo.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         project_dir = wt_base / "feature-branch"
         project_dir.mkdir()
@@ -708,7 +722,7 @@ class TestWorktreeMountsIntegration:
         with self._mock_worktree(main_repo, wt_base, is_worktree=True):
             spec = build_container_spec(config, project_dir, ["bash"])
 
-        sources = [m.source for m in spec.mounts]
+        sources = {m.source for m in spec.mounts}
         # Main repo and wt_base should be present
         assert str(main_repo) in sources
         assert str(wt_base) in sources
@@ -722,11 +736,11 @@ class TestWorktreeMountsIntegration:
         wt_mount = next(m for m in spec.mounts if m.source == str(wt_base))
         assert wt_mount.read_only is False
 
-    def test_normal_session_full_spec(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_normal_session_full_spec(self, mock_linux, clean_env, wt_tmp: Path) -> None:
         """Normal session: build_container_spec includes project_dir and wt_base."""
-        main_repo = tmp_path / "repo"
+        main_repo = wt_tmp / "repo"
         main_repo.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"
+        wt_base = wt_tmp / "worktrees" / "abc123"
         wt_base.mkdir(parents=True)
         project_dir = main_repo
 
@@ -734,23 +748,23 @@ class TestWorktreeMountsIntegration:
         with self._mock_worktree(main_repo, wt_base):
             spec = build_container_spec(config, project_dir, ["bash"])
 
-        sources = [m.source for m in spec.mounts]
+        sources = {m.source for m in spec.mounts}
         # Both project_dir and wt_base should be present
         assert str(project_dir) in sources
         assert str(wt_base) in sources
 
-    def test_normal_session_no_worktrees(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_normal_session_no_worktrees(self, mock_linux, clean_env, wt_tmp: Path) -> None:
         """Normal session without worktrees: project_dir and wt_base mounted."""
-        main_repo = tmp_path / "repo"
+        main_repo = wt_tmp / "repo"
         main_repo.mkdir()
-        wt_base = tmp_path / "worktrees" / "abc123"  # Does not exist yet
+        wt_base = wt_tmp / "worktrees" / "abc123"  # Does not exist yet
         project_dir = main_repo
 
         config = Config()
         with self._mock_worktree(main_repo, wt_base):
             spec = build_container_spec(config, project_dir, ["bash"])
 
-        sources = [m.source for m in spec.mounts]
+        sources = {m.source for m in spec.mounts}
         assert str(project_dir) in sources
         # wt_base is now always created and mounted
         assert str(wt_base) in sources
@@ -760,7 +774,7 @@ class TestWorktreeMountsIntegration:
 class TestActiveToolScoping:
     """Tests for active_tool mount and env scoping."""
 
-    def test_active_tool_mounts_applied(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_active_tool_mounts_applied(self, mock_linux, clean_env, tmp_path: Path, env) -> None:
         """active_tool set: tool's mounts are applied."""
         home = tmp_path / "home"
         (home / ".claude").mkdir(parents=True)
@@ -773,10 +787,10 @@ class TestActiveToolScoping:
             "aider": ToolConfig(mounts=["~/.aider"]),
         }
 
-        with patch.dict(os.environ, {"HOME": str(home)}):
-            spec = build_container_spec(config, tmp_path, ["bash"])
+        env(HOME=str(home))
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
-        targets = [m.target for m in spec.mounts]
+        targets = {m.target for m in spec.mounts}
         sandbox_home = spec.environment.get("HOME", "/home/user")
         # Active tool's mounts applied
         assert f"{sandbox_home}/.claude" in targets
@@ -793,11 +807,11 @@ class TestActiveToolScoping:
 
         spec = build_container_spec(config, tmp_path, ["bash"])
 
-        targets = [m.target for m in spec.mounts]
+        targets = {m.target for m in spec.mounts}
         sandbox_home = spec.environment.get("HOME", "/home/user")
         assert f"{sandbox_home}/.claude" not in targets
 
-    def test_active_tool_env_forwarded(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_active_tool_env_forwarded(self, mock_linux, clean_env, tmp_path: Path, env) -> None:
         """active_tool set: tool's env vars are applied."""
         config = Config()
         config.active_tool = "claude"
@@ -805,13 +819,13 @@ class TestActiveToolScoping:
             "claude": ToolConfig(env={"ANTHROPIC_API_KEY": True, "CUSTOM": "val"}),
         }
 
-        with patch.dict(os.environ, {"USER": "test", "ANTHROPIC_API_KEY": "sk-123"}):
-            spec = build_container_spec(config, tmp_path, ["bash"])
+        env(USER="test", ANTHROPIC_API_KEY="sk-123")
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
         assert spec.environment["ANTHROPIC_API_KEY"] == "sk-123"
         assert spec.environment["CUSTOM"] == "val"
 
-    def test_no_active_tool_no_tool_env(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_no_active_tool_no_tool_env(self, mock_linux, clean_env, tmp_path: Path, env) -> None:
         """active_tool=None: tool env vars are NOT applied."""
         config = Config()
         config.active_tool = None
@@ -819,19 +833,19 @@ class TestActiveToolScoping:
             "claude": ToolConfig(env={"ANTHROPIC_API_KEY": True}),
         }
 
-        with patch.dict(os.environ, {"USER": "test", "ANTHROPIC_API_KEY": "sk-123"}):
-            spec = build_container_spec(config, tmp_path, ["bash"])
+        env(USER="test", ANTHROPIC_API_KEY="sk-123")
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
         assert "ANTHROPIC_API_KEY" not in spec.environment
 
-    def test_global_env_always_applied(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_global_env_always_applied(self, mock_linux, clean_env, tmp_path: Path, env) -> None:
         """Global env is applied regardless of active_tool."""
         config = Config()
         config.active_tool = None
         config.env = {"GITHUB_TOKEN": True, "STATIC": "hello"}
 
-        with patch.dict(os.environ, {"USER": "test", "GITHUB_TOKEN": "ghp_123"}):
-            spec = build_container_spec(config, tmp_path, ["bash"])
+        env(USER="test", GITHUB_TOKEN="ghp_123")
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
         assert spec.environment["GITHUB_TOKEN"] == "ghp_123"
         assert spec.environment["STATIC"] == "hello"
@@ -850,7 +864,7 @@ class TestActiveToolScoping:
 
         assert "MISSING_KEY" not in spec.environment
 
-    def test_tool_mount_readonly(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_tool_mount_readonly(self, mock_linux, clean_env, tmp_path: Path, env) -> None:
         """Tool mount with :ro modifier is mounted read-only."""
         home = tmp_path / "home"
         (home / ".claude" / "ide").mkdir(parents=True)
@@ -861,8 +875,8 @@ class TestActiveToolScoping:
             "claude": ToolConfig(mounts=["~/.claude/ide:ro"]),
         }
 
-        with patch.dict(os.environ, {"HOME": str(home)}):
-            spec = build_container_spec(config, tmp_path, ["bash"])
+        env(HOME=str(home))
+        spec = build_container_spec(config, tmp_path, ["bash"])
 
         sandbox_home = spec.environment.get("HOME", "/home/user")
         ide_mount = next(
@@ -928,10 +942,11 @@ class TestActiveToolScoping:
 class TestSecurityPassthrough:
     """Tests for security settings being passed to ContainerSpec."""
 
-    def test_default_security_in_spec(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_default_security_in_spec(
+        self, mock_linux, clean_env, tmp_path: Path, base_config
+    ) -> None:
         """Default config produces cap_drop/cap_add in spec."""
-        config = Config()
-        spec = build_container_spec(config, tmp_path, ["bash"])
+        spec = build_container_spec(base_config, tmp_path, ["bash"])
 
         assert spec.cap_drop == ["ALL"]
         assert "CHOWN" in spec.cap_add
@@ -1015,10 +1030,11 @@ class TestLxcfsMounts:
         assert "/proc/stat" in targets
         assert all(m.read_only for m in lxcfs_mounts)
 
-    def test_lxcfs_skipped_when_disabled(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_lxcfs_skipped_when_disabled(
+        self, mock_linux, clean_env, tmp_path: Path, base_config
+    ) -> None:
         """lxcfs mounts are not added when disabled (default)."""
-        config = Config()
-        spec = build_container_spec(config, tmp_path, ["bash"])
+        spec = build_container_spec(base_config, tmp_path, ["bash"])
 
         lxcfs_mounts = [m for m in spec.mounts if m.source.startswith("/var/lib/lxcfs/")]
         assert len(lxcfs_mounts) == 0
@@ -1066,38 +1082,35 @@ class TestLxcfsMounts:
 class TestNoProjectMode:
     """Tests for building container specs without a project directory."""
 
-    def test_no_project_working_dir(self, mock_linux, clean_env) -> None:
+    def test_no_project_working_dir(self, mock_linux, clean_env, base_config) -> None:
         """When project_dir is None, working_dir is sandbox home."""
-        config = Config()
-        spec = build_container_spec(config, None, ["bash"])
+        spec = build_container_spec(base_config, None, ["bash"])
         assert spec.working_dir == "/home"
 
-    def test_no_project_skips_project_mount(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_no_project_skips_project_mount(
+        self, mock_linux, clean_env, tmp_path: Path, base_config
+    ) -> None:
         """When project_dir is None, no project directory is mounted."""
-        config = Config()
-        spec = build_container_spec(config, None, ["bash"])
+        spec = build_container_spec(base_config, None, ["bash"])
 
         bind_sources = [m.source for m in spec.mounts if m.type == "bind"]
         # No project-like bind mounts (only optional config mounts)
         for source in bind_sources:
             assert not source.startswith(str(tmp_path))
 
-    def test_no_project_omits_project_path_env(self, mock_linux, clean_env) -> None:
+    def test_no_project_omits_project_path_env(self, mock_linux, clean_env, base_config) -> None:
         """When project_dir is None, PROJECT_PATH is not set."""
-        config = Config()
-        spec = build_container_spec(config, None, ["bash"])
+        spec = build_container_spec(base_config, None, ["bash"])
         assert "PROJECT_PATH" not in spec.environment
 
-    def test_no_project_omits_mise_trusted_paths(self, mock_linux, clean_env) -> None:
+    def test_no_project_omits_mise_trusted_paths(self, mock_linux, clean_env, base_config) -> None:
         """When project_dir is None, MISE_TRUSTED_CONFIG_PATHS is not set."""
-        config = Config()
-        spec = build_container_spec(config, None, ["bash"])
+        spec = build_container_spec(base_config, None, ["bash"])
         assert "MISE_TRUSTED_CONFIG_PATHS" not in spec.environment
 
-    def test_no_project_still_has_home_volume(self, mock_linux, clean_env) -> None:
+    def test_no_project_still_has_home_volume(self, mock_linux, clean_env, base_config) -> None:
         """When project_dir is None, home volume is still mounted."""
-        config = Config()
-        spec = build_container_spec(config, None, ["bash"])
+        spec = build_container_spec(base_config, None, ["bash"])
         home_mount = next(
             (m for m in spec.mounts if m.target == "/home" and m.type == "volume"), None
         )
@@ -1114,10 +1127,11 @@ class TestNoProjectMode:
         assert data_mount is not None
         assert data_mount.source == str(mount_src)
 
-    def test_with_project_has_project_path_env(self, mock_linux, clean_env, tmp_path: Path) -> None:
+    def test_with_project_has_project_path_env(
+        self, mock_linux, clean_env, tmp_path: Path, base_config
+    ) -> None:
         """When project_dir is set, PROJECT_PATH and MISE_TRUSTED_CONFIG_PATHS are set."""
-        config = Config()
-        spec = build_container_spec(config, tmp_path, ["bash"])
+        spec = build_container_spec(base_config, tmp_path, ["bash"])
         assert spec.environment["PROJECT_PATH"] == str(tmp_path)
         assert spec.environment["MISE_TRUSTED_CONFIG_PATHS"] == str(tmp_path)
 
@@ -1202,10 +1216,9 @@ class TestBuildPreamble:
         preamble = _build_preamble(config, Path("/projects/myapp"), [])
         assert "caution" in preamble.lower()
 
-    def test_preamble_in_environment(self, mock_linux, project_dir, clean_env) -> None:
+    def test_preamble_in_environment(self, mock_linux, project_dir, clean_env, base_config) -> None:
         """YAAS_PREAMBLE env var is set in container spec."""
-        config = Config()
-        spec = build_container_spec(config, project_dir, ["bash"])
+        spec = build_container_spec(base_config, project_dir, ["bash"])
         assert "YAAS_PREAMBLE" in spec.environment
         assert "YAAS" in spec.environment["YAAS_PREAMBLE"]
 
@@ -1219,9 +1232,9 @@ class TestBuildPreamble:
 class TestDockerHostSocket:
     """Tests for docker_host_socket feature."""
 
-    def test_socket_mounted_when_found(self, mock_linux, project_dir, clean_env) -> None:
+    def test_socket_mounted_when_found(self, mock_linux, tmp_path: Path, clean_env) -> None:
         """When docker_host_socket=True and socket exists, it's mounted at /var/run/docker.sock."""
-        sock = project_dir / "docker.sock"
+        sock = tmp_path / "docker.sock"
         sock.touch()
 
         with patch(
@@ -1229,7 +1242,7 @@ class TestDockerHostSocket:
         ), patch.object(Path, "stat") as mock_stat:
             mock_stat.return_value.st_gid = 999
             config = Config(docker_host_socket=True)
-            spec = build_container_spec(config, project_dir, ["bash"])
+            spec = build_container_spec(config, tmp_path, ["bash"])
 
         docker_mount = next(
             (m for m in spec.mounts if m.target == "/var/run/docker.sock"), None
@@ -1237,16 +1250,16 @@ class TestDockerHostSocket:
         assert docker_mount is not None
         assert docker_mount.source == str(sock)
 
-    def test_docker_host_env_set(self, mock_linux, project_dir, clean_env) -> None:
+    def test_docker_host_env_set(self, mock_linux, tmp_path: Path, clean_env) -> None:
         """DOCKER_HOST env var is set when docker_host_socket is enabled."""
-        sock = project_dir / "docker.sock"
+        sock = tmp_path / "docker.sock"
         sock.touch()
 
         with patch(
             "yaas.container.get_container_socket_paths", return_value=[sock]
         ):
             config = Config(docker_host_socket=True)
-            spec = build_container_spec(config, project_dir, ["bash"])
+            spec = build_container_spec(config, tmp_path, ["bash"])
 
         assert spec.environment["DOCKER_HOST"] == "unix:///var/run/docker.sock"
 
@@ -1264,16 +1277,16 @@ class TestDockerHostSocket:
         )
         assert docker_mount is None
 
-    def test_keep_groups_enabled(self, mock_linux, project_dir, clean_env) -> None:
+    def test_keep_groups_enabled(self, mock_linux, tmp_path: Path, clean_env) -> None:
         """keep_groups is set on spec when docker_host_socket is enabled."""
-        sock = project_dir / "docker.sock"
+        sock = tmp_path / "docker.sock"
         sock.touch()
 
         with patch(
             "yaas.container.get_container_socket_paths", return_value=[sock]
         ):
             config = Config(docker_host_socket=True)
-            spec = build_container_spec(config, project_dir, ["bash"])
+            spec = build_container_spec(config, tmp_path, ["bash"])
 
         assert spec.keep_groups is True
 
@@ -0,0 +1,49 @@
+"""Tests for shared test fixtures."""
+
+import os
+from collections.abc import Generator
+
+import pytest
+
+_SENTINEL = "YAAS_TEST_HOST_SENTINEL"
+
+
+def _environ() -> dict[str, str]:
+    """Return os.environ without the variable pytest rewrites for every test phase."""
+    return {k: v for k, v in os.environ.items() if k != "PYTEST_CURRENT_TEST"}
+
+
+@pytest.fixture(scope="class")
+def host_env() -> Generator[dict[str, str], None, None]:
+    """Snapshot os.environ, with a known host variable, before any test in the class."""
+    saved_display = os.environ.get("DISPLAY")
+    os.environ[_SENTINEL] = "host"
+    os.environ["DISPLAY"] = ":host"
+    yield _environ()
+    os.environ.pop(_SENTINEL, None)
+    if saved_display is None:
+        os.environ.pop("DISPLAY", None)
+    else:
+        os.environ["DISPLAY"] = saved_display
+
+
+class TestEnvironmentIsolation:
+    """Tests that environment fixtures leave the host environment untouched.
+
+    The tests run in order: the first layers ``env`` on ``clean_env``, the
+    second checks what the first left behind.
+    """
+
+    def test_clean_env_with_env_overrides(self, host_env, clean_env, env) -> None:
+        """Test env() layered on clean_env sees only the overrides."""
+        # Same layering as test_x11_fallback, which must not delete the host's DISPLAY
+        env(**{_SENTINEL: "test"}, DISPLAY=":0")
+
+        assert os.environ[_SENTINEL] == "test"
+        assert os.environ["DISPLAY"] == ":0"
+        assert os.environ["USER"] == "testuser"
+        assert "HOME" not in os.environ
+
+    def test_host_env_restored(self, host_env) -> None:
+        """Test os.environ is back to the host snapshot after the previous test."""
+        assert _environ() == host_env
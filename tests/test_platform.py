@@ -1,15 +1,17 @@
 """Tests for platform detection module."""
 
-import os
-from contextlib import ExitStack, contextmanager
+import io
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, ExitStack, contextmanager
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from unittest.mock import mock_open, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from yaas.platform import (
     PlatformError,
+    _socket_paths,
     check_platform_support,
     get_container_socket_paths,
     get_ssh_agent_socket,
@@ -21,65 +23,87 @@ from yaas.platform import (
 )
 
 
+@contextmanager
+def _on_platform(name: str) -> Generator[None, None, None]:
+    """Patch the cached platform flags as if sys.platform were ``name``."""
+    with patch.multiple(
+        "yaas.platform",
+        IS_LINUX=name == "linux",
+        IS_MACOS=name == "darwin",
+        IS_WINDOWS=name == "win32",
+    ):
+        yield
+
+
+def _fake_env(**variables: str) -> AbstractContextManager[object]:
+    """Patch yaas.platform._env so the module sees only ``variables``."""
+    return patch("yaas.platform._env", lambda name: variables.get(name))
+
+
+def _fake_proc_version(monkeypatch: pytest.MonkeyPatch, contents: bytes) -> None:
+    """Serve ``contents`` for any open() made from yaas.platform."""
+    monkeypatch.setattr(
+        "yaas.platform.open", lambda *args, **kwargs: io.BytesIO(contents), raising=False
+    )
+
+
 class TestPlatformDetection:
     """Tests for platform detection functions."""
 
-    def test_is_linux_on_linux(self) -> None:
-        """Test is_linux returns True on Linux."""
-        with patch("yaas.platform.sys.platform", "linux"):
-            assert is_linux() is True
-
-    def test_is_linux_on_macos(self) -> None:
-        """Test is_linux returns False on macOS."""
-        with patch("yaas.platform.sys.platform", "darwin"):
-            assert is_linux() is False
-
-    def test_is_macos_on_macos(self) -> None:
-        """Test is_macos returns True on macOS."""
-        with patch("yaas.platform.sys.platform", "darwin"):
-            assert is_macos() is True
-
-    def test_is_macos_on_linux(self) -> None:
-        """Test is_macos returns False on Linux."""
-        with patch("yaas.platform.sys.platform", "linux"):
-            assert is_macos() is False
-
-    def test_is_windows_on_windows(self) -> None:
-        """Test is_windows returns True on Windows."""
-        with patch("yaas.platform.sys.platform", "win32"):
-            assert is_windows() is True
-
-    def test_is_windows_on_linux(self) -> None:
-        """Test is_windows returns False on Linux."""
-        with patch("yaas.platform.sys.platform", "linux"):
-            assert is_windows() is False
-
-    def test_is_wsl_on_wsl(self) -> None:
+    @pytest.mark.parametrize(
+        ("platform", "predicate", "expected"),
+        [
+            ("linux", is_linux, True),
+            ("darwin", is_linux, False),
+            ("darwin", is_macos, True),
+            ("linux", is_macos, False),
+            ("win32", is_windows, True),
+            ("linux", is_windows, False),
+        ],
+    )
+    def test_platform_predicate(
+        self, platform: str, predicate: Callable[[], bool], expected: bool
+    ) -> None:
+        """Test is_linux/is_macos/is_windows against each sys.platform value."""
+        with _on_platform(platform):
+            assert predicate() is expected
+
+    def test_is_wsl_on_wsl(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test is_wsl returns True on WSL."""
-        wsl_version = "Linux version 5.10.16.3-microsoft-standard-WSL2"
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.platform.sys.platform", "linux"))
-            stack.enter_context(patch("builtins.open", mock_open(read_data=wsl_version)))
+        _fake_proc_version(monkeypatch, b"Linux version 5.10.16.3-microsoft-standard-WSL2")
+        with _on_platform("linux"):
             assert is_wsl() is True
 
-    def test_is_wsl_on_native_linux(self) -> None:
+    def test_is_wsl_on_native_linux(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test is_wsl returns False on native Linux."""
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.platform.sys.platform", "linux"))
-            stack.enter_context(
-                patch("builtins.open", mock_open(read_data="Linux version 5.15.0-generic"))
-            )
+        _fake_proc_version(monkeypatch, b"Linux version 5.15.0-generic")
+        with _on_platform("linux"):
             assert is_wsl() is False
 
+    def test_is_wsl_reads_proc_version_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test /proc/version is read once per process, not once per call."""
+        opens: list[object] = []
+
+        def fake_open(*args: object, **kwargs: object) -> io.BytesIO:
+            opens.append(args)
+            return io.BytesIO(b"Linux version 5.10.16.3-microsoft-standard-WSL2")
+
+        monkeypatch.setattr("yaas.platform.open", fake_open, raising=False)
+        with _on_platform("linux"):
+            assert is_wsl() is True
+            assert is_wsl() is True
+
+        assert len(opens) == 1
+
     def test_is_wsl_on_macos(self) -> None:
         """Test is_wsl returns False on macOS."""
-        with patch("yaas.platform.sys.platform", "darwin"):
+        with _on_platform("darwin"):
             assert is_wsl() is False
 
     def test_is_wsl_proc_version_unreadable(self) -> None:
         """Test is_wsl returns False when /proc/version cannot be read."""
         with ExitStack() as stack:
-            stack.enter_context(patch("yaas.platform.sys.platform", "linux"))
+            stack.enter_context(_on_platform("linux"))
             stack.enter_context(patch("builtins.open", side_effect=OSError("Permission denied")))
             assert is_wsl() is False
 
@@ -119,31 +143,26 @@ class TestGetUidGid:
 class TestGetSshAgentSocket:
     """Tests for SSH agent socket detection."""
 
-    def test_get_ssh_agent_socket_from_env(self) -> None:
+    def test_get_ssh_agent_socket_from_env(self, env) -> None:
         """Test get_ssh_agent_socket uses SSH_AUTH_SOCK env var."""
         with TemporaryDirectory() as tmpdir:
             sock_path = Path(tmpdir) / "agent.sock"
             sock_path.touch()
 
-            with patch.dict(os.environ, {"SSH_AUTH_SOCK": str(sock_path)}):
-                result = get_ssh_agent_socket()
-                assert result == sock_path
+            env(SSH_AUTH_SOCK=str(sock_path))
+            result = get_ssh_agent_socket()
+            assert result == sock_path
 
     def test_get_ssh_agent_socket_missing_env(self) -> None:
         """Test get_ssh_agent_socket returns None when env not set."""
-        with ExitStack() as stack:
-            stack.enter_context(patch.dict(os.environ, {}, clear=True))
-            stack.enter_context(patch("yaas.platform.is_macos", return_value=False))
+        with _fake_env(), patch("yaas.platform.is_macos", return_value=False):
             result = get_ssh_agent_socket()
             assert result is None
 
-    def test_get_ssh_agent_socket_env_path_not_exists(self) -> None:
+    def test_get_ssh_agent_socket_env_path_not_exists(self, env) -> None:
         """Test get_ssh_agent_socket returns None when env socket doesn't exist."""
-        with ExitStack() as stack:
-            stack.enter_context(
-                patch.dict(os.environ, {"SSH_AUTH_SOCK": "/nonexistent/path/agent.sock"})
-            )
-            stack.enter_context(patch("yaas.platform.is_macos", return_value=False))
+        env(SSH_AUTH_SOCK="/nonexistent/path/agent.sock")
+        with patch("yaas.platform.is_macos", return_value=False):
             result = get_ssh_agent_socket()
             assert result is None
 
@@ -156,28 +175,45 @@ class TestGetSshAgentSocket:
             sock_path.touch()
 
             with ExitStack() as stack:
-                stack.enter_context(patch.dict(os.environ, {}, clear=True))
+                stack.enter_context(_fake_env())
                 stack.enter_context(patch("yaas.platform.is_macos", return_value=True))
                 stack.enter_context(patch("yaas.platform.glob.glob", return_value=[str(sock_path)]))
                 result = get_ssh_agent_socket()
                 assert result == sock_path
 
+    def test_get_ssh_agent_socket_macos_glob_reused(self, tmp_path: Path) -> None:
+        """Test repeated macOS lookups within the TTL scan the launchd dirs once."""
+        sock_path = tmp_path / "Listeners"
+        sock_path.touch()
+
+        with ExitStack() as stack:
+            stack.enter_context(_fake_env())
+            stack.enter_context(patch("yaas.platform.is_macos", return_value=True))
+            mock_glob = stack.enter_context(
+                patch("yaas.platform.glob.glob", return_value=[str(sock_path)])
+            )
+            assert get_ssh_agent_socket() == sock_path
+            assert get_ssh_agent_socket() == sock_path
+
+        mock_glob.assert_called_once()
+
 
 class TestGetContainerSocketPaths:
     """Tests for container socket path detection."""
 
     @staticmethod
     @contextmanager
-    def _mock_linux(extra_env: dict[str, str] | None = None, clear: bool = True):
-        """Mock Linux platform for socket path tests."""
-        env = {"HOME": "/home/testuser"}
-        if extra_env:
-            env.update(extra_env)
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.platform.is_macos", return_value=False))
-            stack.enter_context(patch("yaas.platform.is_linux", return_value=True))
-            stack.enter_context(patch("yaas.platform.os.getuid", return_value=1000))
-            stack.enter_context(patch.dict(os.environ, env, clear=clear))
+    def _mock_linux(**env: str):
+        """Mock Linux platform (seeing only ``env``) for socket path tests."""
+        with (
+            patch.multiple(
+                "yaas.platform",
+                is_macos=MagicMock(return_value=False),
+                is_linux=MagicMock(return_value=True),
+            ),
+            patch("yaas.platform.os.getuid", return_value=1000),
+            _fake_env(**env),
+        ):
             yield
 
     def test_linux_socket_paths(self) -> None:
@@ -205,7 +241,7 @@ class TestGetContainerSocketPaths:
 
     def test_linux_xdg_runtime_socket(self) -> None:
         """Test get_container_socket_paths includes XDG_RUNTIME_DIR socket."""
-        with self._mock_linux({"XDG_RUNTIME_DIR": "/run/user/1000"}, clear=False):
+        with self._mock_linux(XDG_RUNTIME_DIR="/run/user/1000"):
             paths = get_container_socket_paths()
 
         path_strs = [str(p) for p in paths]
@@ -213,7 +249,7 @@ class TestGetContainerSocketPaths:
 
     def test_docker_host_env_priority(self) -> None:
         """Test DOCKER_HOST env var takes highest priority."""
-        with self._mock_linux({"DOCKER_HOST": "unix:///custom/docker.sock"}):
+        with self._mock_linux(DOCKER_HOST="unix:///custom/docker.sock"):
             paths = get_container_socket_paths()
 
         path_strs = [str(p) for p in paths]
@@ -222,16 +258,60 @@ class TestGetContainerSocketPaths:
 
     def test_macos_socket_paths(self) -> None:
         """Test get_container_socket_paths returns macOS Docker Desktop socket paths."""
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.platform.is_macos", return_value=True))
-            stack.enter_context(patch("yaas.platform.Path.home", return_value=Path("/Users/test")))
-            stack.enter_context(patch.dict(os.environ, {}, clear=True))
+        with (
+            patch("yaas.platform.is_macos", return_value=True),
+            patch("yaas.platform.Path.home", return_value=Path("/Users/test")),
+            _fake_env(),
+        ):
             paths = get_container_socket_paths()
 
         path_strs = [str(p) for p in paths]
         assert "/Users/test/.docker/run/docker.sock" in path_strs
         assert "/var/run/docker.sock" in path_strs
 
+    def test_linux_skips_home_lookup(self) -> None:
+        """Test the home directory is only looked up for macOS Docker Desktop paths."""
+        with self._mock_linux(), patch("yaas.platform.Path.home") as mock_home:
+            get_container_socket_paths()
+
+        mock_home.assert_not_called()
+
+    def test_repeated_calls_reuse_cached_paths(self) -> None:
+        """Test unchanged host inputs return the cached path list."""
+        with self._mock_linux(XDG_RUNTIME_DIR="/run/user/1000"):
+            first = get_container_socket_paths()
+            second = get_container_socket_paths()
+
+        assert first == second
+        assert _socket_paths.cache_info().hits == 1
+        assert _socket_paths.cache_info().misses == 1
+
+    @pytest.mark.parametrize(
+        ("before", "after", "expected"),
+        [
+            (
+                {"DOCKER_HOST": "unix:///first.sock"},
+                {"DOCKER_HOST": "unix:///second.sock"},
+                "/second.sock",
+            ),
+            (
+                {"XDG_RUNTIME_DIR": "/run/user/1000"},
+                {"XDG_RUNTIME_DIR": "/run/user/2000"},
+                "/run/user/2000/docker.sock",
+            ),
+        ],
+    )
+    def test_changed_env_returns_new_paths(
+        self, before: dict[str, str], after: dict[str, str], expected: str
+    ) -> None:
+        """Test a changed DOCKER_HOST or XDG_RUNTIME_DIR isn't served from the cache."""
+        with self._mock_linux(**before):
+            get_container_socket_paths()
+        with self._mock_linux(**after):
+            path_strs = [str(p) for p in get_container_socket_paths()]
+
+        assert expected in path_strs
+
 
 class TestPlatformSupport:
     """Tests for platform support checking."""
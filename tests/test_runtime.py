@@ -1,10 +1,16 @@
 """Tests for container runtime."""
 
 from contextlib import ExitStack
+from dataclasses import FrozenInstanceError
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from tests.helpers import make_config, make_spec, mock_docker_socket, mock_which
+import pytest
+
+from tests.helpers import flag_values, make_config, make_spec, mock_docker_socket, mock_which
+from yaas.config import SecuritySettings
 from yaas.runtime import DockerRuntime, Mount, PodmanKrunRuntime, PodmanRuntime
+from yaas.runtime.docker import _probe_docker_sockets
 
 # ============================================================
 # Mount and ContainerSpec dataclass tests
@@ -29,6 +35,14 @@ class TestMount:
 
         assert mount.read_only is True
 
+    def test_immutable(self) -> None:
+        """Test Mount fields can't be reassigned and instances are hashable."""
+        mount = Mount(source="/host", target="/container")
+
+        with pytest.raises(FrozenInstanceError):
+            mount.read_only = True  # type: ignore[misc]
+        assert {mount, Mount(source="/host", target="/container")} == {mount}
+
 
 class TestContainerSpec:
     """Tests for ContainerSpec dataclass."""
@@ -49,21 +63,21 @@ class TestContainerSpec:
 # ============================================================
 
 
+@pytest.mark.usefixtures("linux_env")
 class TestPodmanRuntime:
     """Tests for PodmanRuntime."""
 
     def test_build_command(self) -> None:
         """Test PodmanRuntime command building."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanRuntime()
-            spec = make_spec(
-                command=["echo", "hello"],
-                environment={"FOO": "bar"},
-                mounts=[Mount(source="/host", target="/container")],
-                memory="8g",
-                cpus=2.0,
-            )
-            cmd = runtime._build_command(spec)
+        runtime = PodmanRuntime()
+        spec = make_spec(
+            command=["echo", "hello"],
+            environment={"FOO": "bar"},
+            mounts=[Mount(source="/host", target="/container")],
+            memory="8g",
+            cpus=2.0,
+        )
+        cmd = runtime._build_command(spec)
 
         assert cmd[0] == "podman"
         assert "run" in cmd
@@ -85,10 +99,9 @@ class TestPodmanRuntime:
 
     def test_injects_yaas_runtime_env(self) -> None:
         """Test PodmanRuntime injects YAAS_RUNTIME=podman."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanRuntime()
-            spec = make_spec()
-            cmd = runtime._build_command(spec)
+        runtime = PodmanRuntime()
+        spec = make_spec()
+        cmd = runtime._build_command(spec)
 
         assert "YAAS_RUNTIME=podman" in cmd
         idx = cmd.index("YAAS_RUNTIME=podman")
@@ -96,9 +109,8 @@ class TestPodmanRuntime:
 
     def test_command_prefix(self) -> None:
         """Test PodmanRuntime command_prefix returns podman."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanRuntime()
-            assert runtime.command_prefix == ["podman"]
+        runtime = PodmanRuntime()
+        assert runtime.command_prefix == ["podman"]
 
     def test_not_available_on_non_linux(self) -> None:
         """Test PodmanRuntime is not available on non-Linux platforms."""
@@ -108,58 +120,42 @@ class TestPodmanRuntime:
             runtime = PodmanRuntime()
             assert runtime.is_available() is False
 
-    def test_create_volume_success(self) -> None:
+    def test_create_volume_success(self, mock_subprocess_run) -> None:
         """Test create_volume returns True on success."""
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.runtime.podman.is_linux", return_value=True))
-            mock_run = stack.enter_context(patch("subprocess.run"))
-            mock_run.return_value = MagicMock(returncode=0)
+        runtime = PodmanRuntime()
+        result = runtime.create_volume("test-volume")
 
-            runtime = PodmanRuntime()
-            result = runtime.create_volume("test-volume")
+        assert result is True
+        mock_subprocess_run.assert_called_once()
+        args = mock_subprocess_run.call_args[0][0]
+        assert args == ["podman", "volume", "create", "test-volume"]
 
-            assert result is True
-            mock_run.assert_called_once()
-            args = mock_run.call_args[0][0]
-            assert args == ["podman", "volume", "create", "test-volume"]
-
-    def test_create_volume_failure(self) -> None:
+    def test_create_volume_failure(self, mock_subprocess_run) -> None:
         """Test create_volume returns False on failure."""
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.runtime.podman.is_linux", return_value=True))
-            mock_run = stack.enter_context(patch("subprocess.run"))
-            mock_run.return_value = MagicMock(returncode=1, stderr="error message")
+        mock_subprocess_run.return_value = MagicMock(returncode=1, stderr="error message")
 
-            runtime = PodmanRuntime()
-            result = runtime.create_volume("test-volume")
+        runtime = PodmanRuntime()
+        result = runtime.create_volume("test-volume")
 
-            assert result is False
+        assert result is False
 
-    def test_remove_volume_success(self) -> None:
+    def test_remove_volume_success(self, mock_subprocess_run) -> None:
         """Test remove_volume returns True on success."""
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.runtime.podman.is_linux", return_value=True))
-            mock_run = stack.enter_context(patch("subprocess.run"))
-            mock_run.return_value = MagicMock(returncode=0)
-
-            runtime = PodmanRuntime()
-            result = runtime.remove_volume("test-volume")
+        runtime = PodmanRuntime()
+        result = runtime.remove_volume("test-volume")
 
-            assert result is True
-            args = mock_run.call_args[0][0]
-            assert args == ["podman", "volume", "rm", "-f", "test-volume"]
+        assert result is True
+        args = mock_subprocess_run.call_args[0][0]
+        assert args == ["podman", "volume", "rm", "-f", "test-volume"]
 
-    def test_remove_volume_failure(self) -> None:
+    def test_remove_volume_failure(self, mock_subprocess_run) -> None:
         """Test remove_volume returns False on failure."""
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.runtime.podman.is_linux", return_value=True))
-            mock_run = stack.enter_context(patch("subprocess.run"))
-            mock_run.return_value = MagicMock(returncode=1, stderr="error message")
+        mock_subprocess_run.return_value = MagicMock(returncode=1, stderr="error message")
 
-            runtime = PodmanRuntime()
-            result = runtime.remove_volume("test-volume")
+        runtime = PodmanRuntime()
+        result = runtime.remove_volume("test-volume")
 
-            assert result is False
+        assert result is False
 
 
 # ============================================================
@@ -167,15 +163,15 @@ class TestPodmanRuntime:
 # ============================================================
 
 
+@pytest.mark.usefixtures("linux_env")
 class TestPodmanKrunRuntime:
     """Tests for PodmanKrunRuntime."""
 
     def test_build_command_has_annotation(self) -> None:
         """Test that krun annotation is added before image name."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
-            spec = make_spec(command=["echo", "hello"])
-            cmd = runtime._build_command(spec)
+        runtime = PodmanKrunRuntime()
+        spec = make_spec(command=["echo", "hello"])
+        cmd = runtime._build_command(spec)
 
         assert "--annotation=run.oci.handler=krun" in cmd
         # Annotation must appear before the image
@@ -185,10 +181,9 @@ class TestPodmanKrunRuntime:
 
     def test_omits_userns_and_user_flags(self) -> None:
         """Test that krun omits --userns and --user (VM boots as root)."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
-            spec = make_spec()
-            cmd = runtime._build_command(spec)
+        runtime = PodmanKrunRuntime()
+        spec = make_spec()
+        cmd = runtime._build_command(spec)
 
         assert "--userns=keep-id" not in cmd
         assert "--user" not in cmd
@@ -196,10 +191,9 @@ class TestPodmanKrunRuntime:
 
     def test_passes_runtime_and_host_uid_env_vars(self) -> None:
         """Test that krun injects YAAS_RUNTIME and YAAS_HOST_UID/GID."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
-            spec = make_spec(user="1000:1000")
-            cmd = runtime._build_command(spec)
+        runtime = PodmanKrunRuntime()
+        spec = make_spec(user="1000:1000")
+        cmd = runtime._build_command(spec)
 
         assert "YAAS_RUNTIME=podman-krun" in cmd
         assert "YAAS_HOST_UID=1000" in cmd
@@ -211,10 +205,9 @@ class TestPodmanKrunRuntime:
 
     def test_forces_nix_substituters(self) -> None:
         """Test that krun injects NIX_CONFIG to force substituters online."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
-            spec = make_spec()
-            cmd = runtime._build_command(spec)
+        runtime = PodmanKrunRuntime()
+        spec = make_spec()
+        cmd = runtime._build_command(spec)
 
         assert "NIX_CONFIG=substitute = true" in cmd
         nix_idx = cmd.index("NIX_CONFIG=substitute = true")
@@ -222,17 +215,13 @@ class TestPodmanKrunRuntime:
 
     def test_available_with_krun(self) -> None:
         """Test is_available when both podman and krun are present."""
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.runtime.podman.is_linux", return_value=True))
-            stack.enter_context(mock_which({"podman": "/usr/bin/podman", "krun": "/usr/bin/krun"}))
+        with mock_which({"podman": "/usr/bin/podman", "krun": "/usr/bin/krun"}):
             runtime = PodmanKrunRuntime()
             assert runtime.is_available() is True
 
     def test_not_available_without_krun(self) -> None:
         """Test is_available when krun binary is missing."""
-        with ExitStack() as stack:
-            stack.enter_context(patch("yaas.runtime.podman.is_linux", return_value=True))
-            stack.enter_context(mock_which({"podman": "/usr/bin/podman", "krun": None}))
+        with mock_which({"podman": "/usr/bin/podman", "krun": None}):
             runtime = PodmanKrunRuntime()
             assert runtime.is_available() is False
 
@@ -246,42 +235,35 @@ class TestPodmanKrunRuntime:
 
     def test_adjust_config_disables_lxcfs(self) -> None:
         """Test that adjust_config disables lxcfs for MicroVM compatibility."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
+        runtime = PodmanKrunRuntime()
         config = make_config(lxcfs=True)
         runtime.adjust_config(config)
         assert config.lxcfs is False
 
     def test_adjust_config_noop_when_lxcfs_disabled(self) -> None:
         """Test that adjust_config is a no-op when lxcfs is already disabled."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
+        runtime = PodmanKrunRuntime()
         config = make_config(lxcfs=False)
         runtime.adjust_config(config)
         assert config.lxcfs is False
 
     def test_adjust_config_disables_network_host(self) -> None:
         """Test that adjust_config falls back from host to bridge networking."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
+        runtime = PodmanKrunRuntime()
         config = make_config(network_mode="host")
         runtime.adjust_config(config)
         assert config.network_mode == "bridge"
 
     def test_adjust_config_preserves_bridge_network(self) -> None:
         """Test that adjust_config leaves bridge networking unchanged."""
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
+        runtime = PodmanKrunRuntime()
         config = make_config(network_mode="bridge")
         runtime.adjust_config(config)
         assert config.network_mode == "bridge"
 
     def test_adjust_config_disables_capabilities(self) -> None:
         """Test that adjust_config clears capability restrictions for MicroVM."""
-        from yaas.config import SecuritySettings
-
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
+        runtime = PodmanKrunRuntime()
         config = make_config(
             security=SecuritySettings(cap_drop=["ALL"], cap_add=["CHOWN", "DAC_OVERRIDE"]),
         )
@@ -291,10 +273,7 @@ class TestPodmanKrunRuntime:
 
     def test_adjust_config_noop_when_no_capabilities(self) -> None:
         """Test that adjust_config is a no-op when cap lists are already empty."""
-        from yaas.config import SecuritySettings
-
-        with patch("yaas.runtime.podman.is_linux", return_value=True):
-            runtime = PodmanKrunRuntime()
+        runtime = PodmanKrunRuntime()
         config = make_config(security=SecuritySettings(cap_drop=[], cap_add=[]))
         runtime.adjust_config(config)
         assert config.security.cap_drop == []
@@ -420,48 +399,57 @@ class TestDockerRuntime:
         assert cmd[1] == "docker"
         assert "run" in cmd
 
-    def test_create_volume_success(self) -> None:
+    def test_create_volume_success(self, docker_socket_accessible, mock_subprocess_run) -> None:
         """Test create_volume returns True on success."""
-        with ExitStack() as stack:
-            stack.enter_context(mock_docker_socket(accessible=True))
-            mock_run = stack.enter_context(patch("subprocess.run"))
-            mock_run.return_value = MagicMock(returncode=0)
-
-            runtime = DockerRuntime()
-            result = runtime.create_volume("test-volume")
+        runtime = DockerRuntime()
+        result = runtime.create_volume("test-volume")
 
-            assert result is True
-            args = mock_run.call_args[0][0]
-            assert args == ["docker", "volume", "create", "test-volume"]
+        assert result is True
+        args = mock_subprocess_run.call_args[0][0]
+        assert args == ["docker", "volume", "create", "test-volume"]
 
-    def test_create_volume_with_sudo(self) -> None:
+    def test_create_volume_with_sudo(self, docker_socket_sudo, mock_subprocess_run) -> None:
         """Test create_volume uses sudo when needed."""
-        with ExitStack() as stack:
-            stack.enter_context(mock_docker_socket(accessible=False))
-            stack.enter_context(mock_which({"docker": "/usr/bin/docker", "sudo": "/usr/bin/sudo"}))
-            mock_run = stack.enter_context(patch("subprocess.run"))
-            mock_run.return_value = MagicMock(returncode=0)
-
-            runtime = DockerRuntime()
-            result = runtime.create_volume("test-volume")
+        runtime = DockerRuntime()
+        result = runtime.create_volume("test-volume")
 
-            assert result is True
-            args = mock_run.call_args[0][0]
-            assert args == ["sudo", "docker", "volume", "create", "test-volume"]
+        assert result is True
+        args = mock_subprocess_run.call_args[0][0]
+        assert args == ["sudo", "docker", "volume", "create", "test-volume"]
 
-    def test_remove_volume_success(self) -> None:
+    def test_remove_volume_success(self, docker_socket_accessible, mock_subprocess_run) -> None:
         """Test remove_volume returns True on success."""
-        with ExitStack() as stack:
-            stack.enter_context(mock_docker_socket(accessible=True))
-            mock_run = stack.enter_context(patch("subprocess.run"))
-            mock_run.return_value = MagicMock(returncode=0)
+        runtime = DockerRuntime()
+        result = runtime.remove_volume("test-volume")
 
-            runtime = DockerRuntime()
-            result = runtime.remove_volume("test-volume")
+        assert result is True
+        args = mock_subprocess_run.call_args[0][0]
+        assert args == ["docker", "volume", "rm", "-f", "test-volume"]
+
+    def test_socket_probe_checks_permissions(self, tmp_path: Path) -> None:
+        """Test socket probe accepts a writable path and skips missing ones."""
+        sock = tmp_path / "docker.sock"
+        sock.touch()
+
+        assert _probe_docker_sockets((tmp_path / "missing.sock", sock)) is True
+        assert _probe_docker_sockets((tmp_path / "missing.sock",)) is False
+
+    def test_socket_probe_cached_across_instances(self, tmp_path: Path) -> None:
+        """Test a second DockerRuntime reuses the socket probe instead of re-checking access."""
+        sock = tmp_path / "docker.sock"
+        sock.touch()
+        with ExitStack() as stack:
+            stack.enter_context(
+                patch("yaas.runtime.docker.get_container_socket_paths", return_value=[sock])
+            )
+            mock_access = stack.enter_context(
+                patch("yaas.runtime.docker.os.access", return_value=True)
+            )
+            stack.enter_context(mock_which({"docker": "/usr/bin/docker"}))
+            DockerRuntime()
+            DockerRuntime()
 
-            assert result is True
-            args = mock_run.call_args[0][0]
-            assert args == ["docker", "volume", "rm", "-f", "test-volume"]
+        mock_access.assert_called_once()
 
 
 # ============================================================
@@ -482,8 +470,7 @@ class TestSecurityFlags:
         assert "--cap-drop" in cmd
         assert cmd[cmd.index("--cap-drop") + 1] == "ALL"
         assert "--cap-add" in cmd
-        cap_add_indices = [i for i, x in enumerate(cmd) if x == "--cap-add"]
-        cap_add_values = [cmd[i + 1] for i in cap_add_indices]
+        cap_add_values = flag_values(cmd, "--cap-add")
         assert "CHOWN" in cap_add_values
         assert "KILL" in cap_add_values
 
@@ -497,8 +484,7 @@ class TestSecurityFlags:
 
         assert "--cap-drop" in cmd
         assert cmd[cmd.index("--cap-drop") + 1] == "ALL"
-        cap_add_indices = [i for i, x in enumerate(cmd) if x == "--cap-add"]
-        cap_add_values = [cmd[i + 1] for i in cap_add_indices]
+        cap_add_values = flag_values(cmd, "--cap-add")
         assert "CHOWN" in cap_add_values
         assert "KILL" in cap_add_values
 
@@ -521,11 +507,7 @@ class TestSecurityFlags:
 
         assert "--security-opt" in cmd
         # Podman also has label=disable as first --security-opt, find the seccomp one
-        seccomp_opts = [
-            cmd[i + 1]
-            for i, x in enumerate(cmd)
-            if x == "--security-opt" and cmd[i + 1].startswith("seccomp=")
-        ]
+        seccomp_opts = [v for v in flag_values(cmd, "--security-opt") if v.startswith("seccomp=")]
         assert len(seccomp_opts) == 1
         assert seccomp_opts[0] == "seccomp=/path/to/profile.json"
 
@@ -537,11 +519,7 @@ class TestSecurityFlags:
         spec = make_spec(seccomp_profile="/path/to/profile.json")
         cmd = runtime._build_command(spec)
 
-        seccomp_opts = [
-            cmd[i + 1]
-            for i, x in enumerate(cmd)
-            if x == "--security-opt" and cmd[i + 1].startswith("seccomp=")
-        ]
+        seccomp_opts = [v for v in flag_values(cmd, "--security-opt") if v.startswith("seccomp=")]
         assert len(seccomp_opts) == 1
         assert seccomp_opts[0] == "seccomp=/path/to/profile.json"
 
@@ -552,11 +530,7 @@ class TestSecurityFlags:
             spec = make_spec()
             cmd = runtime._build_command(spec)
 
-        seccomp_opts = [
-            cmd[i + 1]
-            for i, x in enumerate(cmd)
-            if x == "--security-opt" and cmd[i + 1].startswith("seccomp=")
-        ]
+        seccomp_opts = [v for v in flag_values(cmd, "--security-opt") if v.startswith("seccomp=")]
         assert len(seccomp_opts) == 0
 
 
@@ -575,8 +549,7 @@ class TestPortPublishing:
             spec = make_spec(ports=["8080:8080", "3000:3000"])
             cmd = runtime._build_command(spec)
 
-        port_indices = [i for i, x in enumerate(cmd) if x == "-p"]
-        port_values = [cmd[i + 1] for i in port_indices]
+        port_values = flag_values(cmd, "-p")
         assert "8080:8080" in port_values
         assert "3000:3000" in port_values
 
@@ -1,6 +1,9 @@
 """Tests for worktree module."""
 
+import hashlib
+import json
 import os
+import shutil
 import subprocess
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -8,8 +11,10 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from yaas.constants import WORKTREES_DIR
 from yaas.worktree import (
     WorktreeError,
+    _worktree_in_containers,
     add_worktree,
     check_worktree_in_use,
     get_git_root,
@@ -17,6 +22,7 @@ from yaas.worktree import (
     get_worktree_base_dir,
     get_worktree_path,
     get_yaas_worktrees,
+    iter_worktrees,
     list_worktrees,
     remove_worktree,
     repair_worktrees,
@@ -24,40 +30,43 @@ from yaas.worktree import (
 
 
 @pytest.fixture(autouse=True)
-def _clear_worktree_env():
+def _clear_worktree_env(env) -> None:
     """Ensure YAAS_WORKTREE_BASE doesn't leak from host into tests."""
-    with patch.dict(os.environ, {}, clear=False):
-        os.environ.pop("YAAS_WORKTREE_BASE", None)
-        yield
+    env(YAAS_WORKTREE_BASE=None)
+
+
+@pytest.fixture(scope="session")
+def _base_git_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build a git repository with one commit once per session for git_repo to copy."""
+    repo_path = tmp_path_factory.mktemp("base-repo") / "test-repo"
+    repo_path.mkdir()
+    # Initialize git repo
+    subprocess.run(["git", "init"], cwd=repo_path, capture_output=True)
+    subprocess.run(
+        ["git", "config", "user.email", "test@test.com"],
+        cwd=repo_path,
+        capture_output=True,
+    )
+    subprocess.run(
+        ["git", "config", "user.name", "Test User"],
+        cwd=repo_path,
+        capture_output=True,
+    )
+    # Create initial commit
+    (repo_path / "README.md").write_text("# Test")
+    subprocess.run(["git", "add", "README.md"], cwd=repo_path, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-m", "Initial commit"],
+        cwd=repo_path,
+        capture_output=True,
+    )
+    return repo_path
 
 
 @pytest.fixture
-def git_repo():
-    """Create a temporary git repository for testing."""
-    with TemporaryDirectory() as tmpdir:
-        repo_path = Path(tmpdir) / "test-repo"
-        repo_path.mkdir()
-        # Initialize git repo
-        subprocess.run(["git", "init"], cwd=repo_path, capture_output=True)
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=repo_path,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test User"],
-            cwd=repo_path,
-            capture_output=True,
-        )
-        # Create initial commit
-        (repo_path / "README.md").write_text("# Test")
-        subprocess.run(["git", "add", "README.md"], cwd=repo_path, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=repo_path,
-            capture_output=True,
-        )
-        yield repo_path
+def git_repo(_base_git_repo: Path, tmp_path: Path) -> Path:
+    """Create a temporary git repository for testing (a copy of the session base repo)."""
+    return Path(shutil.copytree(_base_git_repo, tmp_path / "test-repo", symlinks=True))
 
 
 def test_get_git_root(git_repo: Path) -> None:
@@ -66,6 +75,35 @@ def test_get_git_root(git_repo: Path) -> None:
     assert root == git_repo
 
 
+def test_get_git_root_non_utf8_path(git_repo: Path) -> None:
+    """Test a repository whose path isn't valid UTF-8 resolves to the same path."""
+    repo = git_repo.rename(git_repo.parent / os.fsdecode(b"caf\xe9-repo"))
+    assert get_git_root(repo) == repo
+
+
+def test_get_git_root_cached(git_repo: Path) -> None:
+    """Test repeated lookups for the same directory don't re-run git."""
+    root = get_git_root(git_repo)
+
+    with patch("subprocess.run") as mock_run:
+        assert get_git_root(git_repo) == root
+
+    mock_run.assert_not_called()
+
+
+def test_get_git_root_relative_path_after_chdir(
+    _base_git_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the same relative path resolves against the current directory on each call."""
+    first = Path(shutil.copytree(_base_git_repo, tmp_path / "one" / "repo", symlinks=True))
+    second = Path(shutil.copytree(_base_git_repo, tmp_path / "two" / "repo", symlinks=True))
+
+    monkeypatch.chdir(first.parent)
+    assert get_git_root(Path("repo")) == first
+    monkeypatch.chdir(second.parent)
+    assert get_git_root(Path("repo")) == second
+
+
 def test_get_git_root_not_a_repo() -> None:
     """Test error when not in a git repository."""
     with TemporaryDirectory() as tmpdir:
@@ -85,55 +123,37 @@ def test_get_project_hash(git_repo: Path) -> None:
     assert hash1 == hash2
 
 
-def test_get_project_hash_different_repos() -> None:
+def test_get_project_hash_matches_existing_dirs(git_repo: Path) -> None:
+    """Test project hash stays SHA256-based so existing worktree dirs are found."""
+    git_root = get_git_root(git_repo)
+    expected = hashlib.sha256(str(git_root).encode()).hexdigest()[:12]
+    assert get_project_hash(git_repo) == expected
+
+
+def test_get_project_hash_different_repos(_base_git_repo: Path, tmp_path: Path) -> None:
     """Test that different repos get different hashes."""
-    with TemporaryDirectory() as tmpdir1, TemporaryDirectory() as tmpdir2:
-        repo1 = Path(tmpdir1) / "repo1"
-        repo2 = Path(tmpdir2) / "repo2"
-        repo1.mkdir()
-        repo2.mkdir()
-
-        for repo in [repo1, repo2]:
-            subprocess.run(["git", "init"], cwd=repo, capture_output=True)
-            subprocess.run(
-                ["git", "config", "user.email", "test@test.com"],
-                cwd=repo,
-                capture_output=True,
-            )
-            subprocess.run(
-                ["git", "config", "user.name", "Test User"],
-                cwd=repo,
-                capture_output=True,
-            )
-            (repo / "README.md").write_text("# Test")
-            subprocess.run(["git", "add", "README.md"], cwd=repo, capture_output=True)
-            subprocess.run(
-                ["git", "commit", "-m", "Initial"],
-                cwd=repo,
-                capture_output=True,
-            )
-
-        hash1 = get_project_hash(repo1)
-        hash2 = get_project_hash(repo2)
-        assert hash1 != hash2
+    repo1 = Path(shutil.copytree(_base_git_repo, tmp_path / "repo1", symlinks=True))
+    repo2 = Path(shutil.copytree(_base_git_repo, tmp_path / "repo2", symlinks=True))
+
+    hash1 = get_project_hash(repo1)
+    hash2 = get_project_hash(repo2)
+    assert hash1 != hash2
 
 
 def test_get_worktree_base_dir(git_repo: Path) -> None:
     """Test getting worktree base directory."""
-    from yaas.constants import WORKTREES_DIR
-
     base_dir = get_worktree_base_dir(git_repo)
     project_hash = get_project_hash(git_repo)
 
     assert base_dir == WORKTREES_DIR / project_hash
 
 
-def test_get_worktree_base_dir_env_override(git_repo: Path) -> None:
+def test_get_worktree_base_dir_env_override(git_repo: Path, env) -> None:
     """Test YAAS_WORKTREE_BASE env var overrides computed path."""
     override_path = "/custom/worktree/base"
 
-    with patch.dict("os.environ", {"YAAS_WORKTREE_BASE": override_path}):
-        base_dir = get_worktree_base_dir(git_repo)
+    env(YAAS_WORKTREE_BASE=override_path)
+    base_dir = get_worktree_base_dir(git_repo)
 
     assert base_dir == Path(override_path)
 
@@ -149,7 +169,7 @@ def test_list_worktrees(git_repo: Path) -> None:
 
 def test_list_worktrees_porcelain_parsing() -> None:
     """Test parsing of git worktree list --porcelain output."""
-    porcelain_output = """worktree /path/to/main
+    porcelain_output = b"""worktree /path/to/main
 HEAD abc123def456
 branch refs/heads/main
 
@@ -166,7 +186,7 @@ detached
         mock_run.return_value = MagicMock(
             returncode=0,
             stdout=porcelain_output,
-            stderr="",
+            stderr=b"",
         )
 
         worktrees = list_worktrees(Path("/fake/repo"))
@@ -178,6 +198,63 @@ detached
     assert worktrees[2]["detached"] == "true"
 
 
+def test_list_worktrees_bare_and_locked_records() -> None:
+    """Test records without HEAD/branch lines and with extra labels are kept intact."""
+    porcelain_output = b"""worktree /path/to/bare.git
+bare
+
+worktree /path/to/locked
+HEAD abc123def456
+branch refs/heads/locked
+locked on a removable drive
+
+worktree /path/to/stale
+HEAD def456abc789
+detached
+prunable gitdir file points to non-existent location
+
+"""
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(returncode=0, stdout=porcelain_output, stderr=b"")
+
+        worktrees = list_worktrees(Path("/fake/repo"))
+
+    assert worktrees == [
+        {"path": "/path/to/bare.git", "bare": "true"},
+        {"path": "/path/to/locked", "head": "abc123def456", "branch": "refs/heads/locked"},
+        {"path": "/path/to/stale", "head": "def456abc789", "detached": "true"},
+    ]
+
+
+def test_iter_worktrees_yields_lazily() -> None:
+    """Test worktrees are yielded one at a time in porcelain order."""
+    porcelain_output = b"worktree /path/to/main\nHEAD abc123\n\nworktree /path/to/wt\nHEAD def456\n"
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(returncode=0, stdout=porcelain_output, stderr=b"")
+
+        worktrees = iter_worktrees(Path("/fake/repo"))
+        mock_run.assert_not_called()
+        assert next(worktrees)["path"] == "/path/to/main"
+        assert next(worktrees)["path"] == "/path/to/wt"
+        assert next(worktrees, None) is None
+
+
+def test_list_worktrees_non_utf8_path() -> None:
+    """Test worktree paths that aren't valid UTF-8 decode with the filesystem encoding."""
+    raw_path = b"/path/to/caf\xe9"
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=b"worktree " + raw_path + b"\nHEAD abc123\ndetached\n\n",
+            stderr=b"",
+        )
+
+        worktrees = list_worktrees(Path("/fake/repo"))
+
+    assert len(worktrees) == 1
+    assert os.fsencode(worktrees[0]["path"]) == raw_path
+
+
 def test_add_worktree(git_repo: Path) -> None:
     """Test creating a worktree."""
     with patch("yaas.worktree.WORKTREES_DIR", git_repo.parent / "worktrees"):
@@ -266,8 +343,8 @@ def test_check_worktree_in_use_no_containers() -> None:
     with patch("subprocess.run") as mock_run:
         mock_run.return_value = MagicMock(
             returncode=0,
-            stdout="[]",
-            stderr="",
+            stdout=b"[]",
+            stderr=b"",
         )
 
         result = check_worktree_in_use(Path("/some/worktree"), ["podman"])
@@ -276,8 +353,6 @@ def test_check_worktree_in_use_no_containers() -> None:
 
 def test_check_worktree_in_use_with_matching_container() -> None:
     """Test checking worktree usage when container has it mounted."""
-    import json
-
     containers = [
         {
             "Id": "abc123",
@@ -288,20 +363,87 @@ def test_check_worktree_in_use_with_matching_container() -> None:
     with patch("subprocess.run") as mock_run:
         mock_run.return_value = MagicMock(
             returncode=0,
-            stdout=json.dumps(containers),
-            stderr="",
+            stdout=json.dumps(containers).encode(),
+            stderr=b"",
         )
 
         result = check_worktree_in_use(Path("/some/worktree"), ["podman"])
         assert result is True
 
 
+def test_check_worktree_in_use_other_mounts_only() -> None:
+    """Test containers mounting unrelated paths don't count as using the worktree."""
+    containers = [{"Id": "abc123", "Mounts": [{"Source": "/other/dir"}]}]
+
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps(containers).encode(),
+            stderr=b"",
+        )
+
+        assert check_worktree_in_use(Path("/some/worktree"), ["podman"]) is False
+
+
+def test_check_worktree_in_use_escaped_path() -> None:
+    """Test paths that JSON escapes are still matched after parsing."""
+    worktree = Path("/some/caf\u00e9 & co")
+    containers = [{"Id": "abc123", "Mounts": [{"Source": str(worktree)}]}]
+
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps(containers).encode(),
+            stderr=b"",
+        )
+
+        assert check_worktree_in_use(worktree, ["podman"]) is True
+
+
+def test_check_worktree_in_use_relative_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a relative worktree path matches the absolute mount source."""
+    monkeypatch.chdir(tmp_path)
+    containers = [{"Id": "abc123", "Mounts": [{"Source": str(tmp_path / "wt")}]}]
+
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=json.dumps(containers).encode(),
+            stderr=b"",
+        )
+
+        assert check_worktree_in_use(Path("wt"), ["podman"]) is True
+
+
+def test_worktree_in_containers_shared_output() -> None:
+    """Test one ps output can be checked against several worktrees."""
+    containers = [{"Id": "abc123", "Mounts": [{"Source": "/wt/one"}]}]
+    ps_output = json.dumps(containers).encode()
+
+    assert _worktree_in_containers(Path("/wt/one"), ps_output) is True
+    assert _worktree_in_containers(Path("/wt/two"), ps_output) is False
+    assert _worktree_in_containers(Path("/wt/one"), b"") is False
+
+
+def test_worktree_in_containers_string_mounts() -> None:
+    """Test podman's string-form Mounts match while other fields don't."""
+    containers = [
+        {"Id": "abc123", "Mounts": ["/wt/one"], "Command": ["ls", "/wt/two"]},
+    ]
+    ps_output = json.dumps(containers).encode()
+
+    assert _worktree_in_containers(Path("/wt/one"), ps_output) is True
+    assert _worktree_in_containers(Path("/wt/two"), ps_output) is False
+
+
 def test_check_worktree_in_use_runtime_not_available() -> None:
     """Test checking worktree usage when runtime is not available."""
     with patch("subprocess.run") as mock_run:
         mock_run.return_value = MagicMock(
             returncode=1,
-            stdout="",
+            stdout=b"",
             stderr="command not found",
         )
 
@@ -315,8 +457,8 @@ def test_check_worktree_in_use_with_sudo_docker() -> None:
     with patch("subprocess.run") as mock_run:
         mock_run.return_value = MagicMock(
             returncode=0,
-            stdout="[]",
-            stderr="",
+            stdout=b"[]",
+            stderr=b"",
         )
 
         result = check_worktree_in_use(Path("/some/worktree"), ["sudo", "docker"])
@@ -333,3 +475,19 @@ def test_repair_worktrees_no_repairs_needed(git_repo: Path) -> None:
         messages = repair_worktrees(git_repo)
         # Should complete without error
         assert isinstance(messages, list)
+
+
+def test_repair_worktrees_after_project_move(git_repo: Path) -> None:
+    """Test worktrees follow a moved project to its new hash dir and stay usable."""
+    with patch("yaas.worktree.WORKTREES_DIR", git_repo.parent / "worktrees"):
+        old_path = add_worktree("moved-wt", project_dir=git_repo)
+        moved_repo = git_repo.rename(git_repo.parent / "moved-repo")
+
+        messages = repair_worktrees(moved_repo)
+        new_path = get_worktree_base_dir(moved_repo) / "moved-wt"
+
+        assert any("Moved worktree 'moved-wt'" in m for m in messages)
+        assert not old_path.parent.exists()
+        assert any("Removed empty directory" in m for m in messages)
+        assert str(new_path) in [wt["path"] for wt in list_worktrees(moved_repo)]
+        assert get_git_root(new_path) == new_path